@@ -0,0 +1,47 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import os
+
+import pytest
+
+import function_calls
+
+_FIXED_TIMESTAMP = "2024-01-01T00:00:00"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _openai_key():
+    """Provide a dummy API key for the whole test session.
+
+    patch.dict copies and restores the entire environment on every
+    enter/exit; a one-time setdefault in the worker process gives the
+    same isolation without that per-use cost.
+    """
+    os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+
+@pytest.fixture(autouse=True)
+def fixed_timestamp(monkeypatch):
+    """Pin follow-up action timestamps to a known value.
+
+    Record ids are already deterministic counters; pinning the clock as
+    well makes email and callback records byte-identical across reruns,
+    so tests can assert them by equality and benchmark runs stay
+    comparable. Returns the pinned ISO string for tests that check it.
+    """
+    monkeypatch.setattr(function_calls, "_current_timestamp", lambda: _FIXED_TIMESTAMP)
+    return _FIXED_TIMESTAMP
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    """Keep retry backoff instantaneous in tests.
+
+    The shared HTTP session retries with exponential backoff, and tests
+    that exercise failure paths against an unreachable API would otherwise
+    spend most of the suite's wall time in time.sleep — urllib3's Retry
+    sleeps through this same module-level function.
+    """
+    monkeypatch.setattr("time.sleep", lambda *args, **kwargs: None)
@@ -2,226 +2,275 @@
 Demo script for the pharmacy chatbot system.
 """
 
+import io
 import os
 import sys
-from typing import Optional
+from contextlib import contextmanager
+from typing import Optional, TextIO
 from dotenv import load_dotenv
 
-from llm import PharmacyChatbot
-from integration import PharmacyAPI
 from function_calls import FollowUpActions
 
+# llm and integration (and their OpenAI/HTTP dependencies) are imported
+# lazily inside the demos that need them, so starting the menu or running
+# the follow-up actions demo doesn't pay their import cost.
+
 # Load environment variables
 load_dotenv()
 
+# Snapshot values that would otherwise be recomputed on every call
+_OPENAI_KEY = os.getenv("OPENAI_API_KEY")
+_SEPARATOR = "\n" + "=" * 60 + "\n"
+
+
+@contextmanager
+def buffered_output():
+    """Collect a demo's output and flush it to stdout in a single write.
+
+    The scripted demos emit dozens of lines; buffering them turns that many
+    stdout syscalls into one, which matters under tee/CI log capture.
+    """
+    buf = io.StringIO()
+    try:
+        yield buf
+    finally:
+        sys.stdout.write(buf.getvalue())
+        sys.stdout.flush()
+
 
-def print_separator():
+def print_separator(file: Optional[TextIO] = None):
     """Print a separator line."""
-    print("\n" + "=" * 60 + "\n")
+    print(_SEPARATOR, file=file)
 
 
-def print_header(title: str):
+def print_header(title: str, file: Optional[TextIO] = None):
     """Print a formatted header."""
-    print_separator()
-    print(f"🤖 {title}")
-    print_separator()
+    print_separator(file)
+    print(f"🤖 {title}", file=file)
+    print_separator(file)
 
 
 def demo_existing_customer():
     """Demo conversation with an existing customer."""
-    print_header("DEMO: Existing Customer Call")
-
-    # Initialize chatbot
-    chatbot = PharmacyChatbot()
-
-    # Start call with existing pharmacy phone number
-    print("📞 Starting call from existing customer...")
-    greeting = chatbot.start_call("555-123-4567")
-    print(f"Bot: {greeting}")
-
-    # Simulate conversation
-    conversation = [
-        "Hi, we're having some issues with our current system and wanted to see what you can offer.",
-        "Yes, we're definitely interested in upgrading. Our current system is quite outdated.",
-        "That sounds great! We'd love to see a demo of your system.",
-        "Perfect, let's schedule that for next week. How about Tuesday at 2 PM?",
-        "Great! Looking forward to it. Thanks for your help.",
-    ]
-
-    for i, user_message in enumerate(conversation, 1):
-        print(f"\nUser: {user_message}")
-        response = chatbot.process_message(user_message)
-        print(f"Bot: {response}")
-
-    # Show conversation summary
-    print_separator()
-    print("📊 CONVERSATION SUMMARY")
-    summary = chatbot.get_conversation_summary()
-    print(f"State: {summary['state']}")
-    print(
-        f"Pharmacy: {summary['pharmacy_data']['name'] if summary['pharmacy_data'] else 'New Lead'}"
-    )
-    print(
-        f"Rx Volume: {summary['pharmacy_data']['rx_volume'] if summary['pharmacy_data'] else 'Unknown'}"
-    )
-    print(f"Emails Sent: {summary['follow_up_actions']['emails_sent']}")
-    print(f"Callbacks Scheduled: {summary['follow_up_actions']['callbacks_scheduled']}")
+    from llm import PharmacyChatbot
+    with buffered_output() as out:
+        print_header("DEMO: Existing Customer Call", out)
+
+        # Initialize chatbot
+        chatbot = PharmacyChatbot()
+
+        # Start call with existing pharmacy phone number
+        print("📞 Starting call from existing customer...", file=out)
+        greeting = chatbot.start_call("555-123-4567")
+        print(f"Bot: {greeting}", file=out)
+
+        # Simulate conversation
+        conversation = [
+            "Hi, we're having some issues with our current system and wanted to see what you can offer.",
+            "Yes, we're definitely interested in upgrading. Our current system is quite outdated.",
+            "That sounds great! We'd love to see a demo of your system.",
+            "Perfect, let's schedule that for next week. How about Tuesday at 2 PM?",
+            "Great! Looking forward to it. Thanks for your help.",
+        ]
+
+        for i, user_message in enumerate(conversation, 1):
+            print(f"\nUser: {user_message}", file=out)
+            response = chatbot.process_message(user_message)
+            print(f"Bot: {response}", file=out)
+
+        # Show conversation summary
+        print_separator(out)
+        print("📊 CONVERSATION SUMMARY", file=out)
+        summary = chatbot.get_conversation_summary()
+        print(f"State: {summary['state']}", file=out)
+        print(
+            f"Pharmacy: {summary['pharmacy_data']['name'] if summary['pharmacy_data'] else 'New Lead'}",
+            file=out,
+        )
+        print(
+            f"Rx Volume: {summary['pharmacy_data']['rx_volume'] if summary['pharmacy_data'] else 'Unknown'}",
+            file=out,
+        )
+        print(f"Emails Sent: {summary['follow_up_actions']['emails_sent']}", file=out)
+        print(
+            f"Callbacks Scheduled: {summary['follow_up_actions']['callbacks_scheduled']}",
+            file=out,
+        )
 
 
 def demo_new_lead():
     """Demo conversation with a new lead."""
-    print_header("DEMO: New Lead Call")
-
-    # Initialize chatbot
-    chatbot = PharmacyChatbot()
-
-    # Start call with new phone number
-    print("📞 Starting call from new lead...")
-    greeting = chatbot.start_call("555-999-9999")
-    print(f"Bot: {greeting}")
-
-    # Simulate conversation
-    conversation = [
-        "Hi, I'm calling about pharmacy management software. We're opening a new pharmacy next month.",
-        "Our pharmacy will be called 'Sunset Pharmacy' and we'll be located in San Diego.",
-        "We're expecting to process about 800 prescriptions per month initially.",
-        "I'm Sarah Johnson, the pharmacy manager. My email is sarah@sunsetpharmacy.com",
-        "Yes, we're very interested in learning more about your solutions.",
-        "Email would be great! Please send us the information.",
-        "Thank you so much for your help!",
-    ]
-
-    for i, user_message in enumerate(conversation, 1):
-        print(f"\nUser: {user_message}")
-        response = chatbot.process_message(user_message)
-        print(f"Bot: {response}")
-
-    # Show conversation summary
-    print_separator()
-    print("📊 CONVERSATION SUMMARY")
-    summary = chatbot.get_conversation_summary()
-    print(f"State: {summary['state']}")
-    print(f"Collected Info: {summary['collected_info']}")
-    print(f"Emails Sent: {summary['follow_up_actions']['emails_sent']}")
-    print(f"Callbacks Scheduled: {summary['follow_up_actions']['callbacks_scheduled']}")
+    from llm import PharmacyChatbot
+    with buffered_output() as out:
+        print_header("DEMO: New Lead Call", out)
+
+        # Initialize chatbot
+        chatbot = PharmacyChatbot()
+
+        # Start call with new phone number
+        print("📞 Starting call from new lead...", file=out)
+        greeting = chatbot.start_call("555-999-9999")
+        print(f"Bot: {greeting}", file=out)
+
+        # Simulate conversation
+        conversation = [
+            "Hi, I'm calling about pharmacy management software. We're opening a new pharmacy next month.",
+            "Our pharmacy will be called 'Sunset Pharmacy' and we'll be located in San Diego.",
+            "We're expecting to process about 800 prescriptions per month initially.",
+            "I'm Sarah Johnson, the pharmacy manager. My email is sarah@sunsetpharmacy.com",
+            "Yes, we're very interested in learning more about your solutions.",
+            "Email would be great! Please send us the information.",
+            "Thank you so much for your help!",
+        ]
+
+        for i, user_message in enumerate(conversation, 1):
+            print(f"\nUser: {user_message}", file=out)
+            response = chatbot.process_message(user_message)
+            print(f"Bot: {response}", file=out)
+
+        # Show conversation summary
+        print_separator(out)
+        print("📊 CONVERSATION SUMMARY", file=out)
+        summary = chatbot.get_conversation_summary()
+        print(f"State: {summary['state']}", file=out)
+        print(f"Collected Info: {summary['collected_info']}", file=out)
+        print(f"Emails Sent: {summary['follow_up_actions']['emails_sent']}", file=out)
+        print(
+            f"Callbacks Scheduled: {summary['follow_up_actions']['callbacks_scheduled']}",
+            file=out,
+        )
 
 
 def demo_high_volume_pharmacy():
     """Demo conversation with a high volume pharmacy."""
-    print_header("DEMO: High Volume Pharmacy Call")
+    from llm import PharmacyChatbot
+    with buffered_output() as out:
+        print_header("DEMO: High Volume Pharmacy Call", out)
+
+        # Initialize chatbot
+        chatbot = PharmacyChatbot()
+
+        # Start call with new phone number
+        print("📞 Starting call from high volume pharmacy...", file=out)
+        greeting = chatbot.start_call("555-777-8888")
+        print(f"Bot: {greeting}", file=out)
+
+        # Simulate conversation
+        conversation = [
+            "Hello, we're looking to upgrade our pharmacy management system. We're processing about 2000 prescriptions per month.",
+            "We're 'Mega Pharmacy' located in Los Angeles. I'm Mike Rodriguez, the owner.",
+            "Our current system is struggling with the volume. We need something more robust.",
+            "That sounds exactly like what we need! The priority implementation is very appealing.",
+            "Yes, please send us the detailed information about your high-volume program.",
+            "My email is mike@megapharmacy.com",
+            "Perfect! We're very excited about this opportunity.",
+        ]
+
+        for i, user_message in enumerate(conversation, 1):
+            print(f"\nUser: {user_message}", file=out)
+            response = chatbot.process_message(user_message)
+            print(f"Bot: {response}", file=out)
+
+        # Show conversation summary
+        print_separator(out)
+        print("📊 CONVERSATION SUMMARY", file=out)
+        summary = chatbot.get_conversation_summary()
+        print(f"State: {summary['state']}", file=out)
+        print(f"Collected Info: {summary['collected_info']}", file=out)
+        print(f"Emails Sent: {summary['follow_up_actions']['emails_sent']}", file=out)
+        print(
+            f"Callbacks Scheduled: {summary['follow_up_actions']['callbacks_scheduled']}",
+            file=out,
+        )
 
-    # Initialize chatbot
-    chatbot = PharmacyChatbot()
 
-    # Start call with new phone number
-    print("📞 Starting call from high volume pharmacy...")
-    greeting = chatbot.start_call("555-777-8888")
-    print(f"Bot: {greeting}")
+def demo_api_integration():
+    """Demo the API integration functionality."""
+    from integration import PharmacyAPI
+    with buffered_output() as out:
+        print_header("DEMO: API Integration", out)
 
-    # Simulate conversation
-    conversation = [
-        "Hello, we're looking to upgrade our pharmacy management system. We're processing about 2000 prescriptions per month.",
-        "We're 'Mega Pharmacy' located in Los Angeles. I'm Mike Rodriguez, the owner.",
-        "Our current system is struggling with the volume. We need something more robust.",
-        "That sounds exactly like what we need! The priority implementation is very appealing.",
-        "Yes, please send us the detailed information about your high-volume program.",
-        "My email is mike@megapharmacy.com",
-        "Perfect! We're very excited about this opportunity.",
-    ]
-
-    for i, user_message in enumerate(conversation, 1):
-        print(f"\nUser: {user_message}")
-        response = chatbot.process_message(user_message)
-        print(f"Bot: {response}")
-
-    # Show conversation summary
-    print_separator()
-    print("📊 CONVERSATION SUMMARY")
-    summary = chatbot.get_conversation_summary()
-    print(f"State: {summary['state']}")
-    print(f"Collected Info: {summary['collected_info']}")
-    print(f"Emails Sent: {summary['follow_up_actions']['emails_sent']}")
-    print(f"Callbacks Scheduled: {summary['follow_up_actions']['callbacks_scheduled']}")
+        api = PharmacyAPI()
 
+        print("🔍 Fetching all pharmacies from API...", file=out)
+        try:
+            pharmacies = api.get_all_pharmacies()
+            print(f"Found {len(pharmacies)} pharmacies in the system", file=out)
 
-def demo_api_integration():
-    """Demo the API integration functionality."""
-    print_header("DEMO: API Integration")
+            # Index by cleaned phone number once so later lookups are dict hits
+            # instead of refetching and scanning the whole list.
+            by_phone = {p.cleaned_phone: p for p in pharmacies}
 
-    api = PharmacyAPI()
+            if pharmacies:
+                print("\n📋 Sample pharmacy data:", file=out)
+                for i, pharmacy in enumerate(pharmacies[:3], 1):
+                    print(
+                        f"{i}. {pharmacy.name} - {pharmacy.location} - {pharmacy.rx_volume} Rx/month",
+                        file=out,
+                    )
 
-    print("🔍 Fetching all pharmacies from API...")
-    try:
-        pharmacies = api.get_all_pharmacies()
-        print(f"Found {len(pharmacies)} pharmacies in the system")
-
-        if pharmacies:
-            print("\n📋 Sample pharmacy data:")
-            for i, pharmacy in enumerate(pharmacies[:3], 1):
-                print(
-                    f"{i}. {pharmacy.name} - {pharmacy.location} - {pharmacy.rx_volume} Rx/month"
-                )
-
-        print("\n🔍 Looking up specific pharmacy by phone...")
-        pharmacy = api.get_pharmacy_by_phone("555-123-4567")
-        if pharmacy:
-            print(f"Found: {pharmacy.name} in {pharmacy.location}")
-        else:
-            print("Pharmacy not found")
+            print("\n🔍 Looking up specific pharmacy by phone...", file=out)
+            pharmacy = by_phone.get(api._clean_phone_number("555-123-4567"))
+            if pharmacy:
+                print(f"Found: {pharmacy.name} in {pharmacy.location}", file=out)
+            else:
+                print("Pharmacy not found", file=out)
 
-        print("\n🏆 High volume pharmacies (1000+ Rx/month):")
-        high_volume = api.get_high_volume_pharmacies()
-        for pharmacy in high_volume:
-            print(f"• {pharmacy.name}: {pharmacy.rx_volume} Rx/month")
+            print("\n🏆 High volume pharmacies (1000+ Rx/month):", file=out)
+            high_volume = api.get_high_volume_pharmacies()
+            for pharmacy in high_volume:
+                print(f"• {pharmacy.name}: {pharmacy.rx_volume} Rx/month", file=out)
 
-    except Exception as e:
-        print(f"Error accessing API: {e}")
+        except Exception as e:
+            print(f"Error accessing API: {e}", file=out)
 
 
 def demo_follow_up_actions():
     """Demo the follow-up actions functionality."""
-    print_header("DEMO: Follow-up Actions")
+    with buffered_output() as out:
+        print_header("DEMO: Follow-up Actions", out)
 
-    actions = FollowUpActions()
+        actions = FollowUpActions()
 
-    # Demo email sending
-    print("📧 Testing email functionality...")
-    from integration import PharmacyData
+        # Demo email sending
+        print("📧 Testing email functionality...", file=out)
+        from integration import PharmacyData
 
-    pharmacy = PharmacyData(
-        id="1",
-        name="Demo Pharmacy",
-        phone="555-123-4567",
-        location="Demo City",
-        rx_volume=1500,
-        contact_person="Demo Manager",
-        email="demo@pharmacy.com",
-    )
+        pharmacy = PharmacyData(
+            id="1",
+            name="Demo Pharmacy",
+            phone="555-123-4567",
+            location="Demo City",
+            rx_volume=1500,
+            contact_person="Demo Manager",
+            email="demo@pharmacy.com",
+        )
 
-    # Send welcome email
-    result = actions.send_welcome_email(pharmacy)
-    print(f"Welcome email result: {result['success']}")
+        # Send welcome email
+        result = actions.send_welcome_email(pharmacy)
+        print(f"Welcome email result: {result['success']}", file=out)
 
-    # Send high volume offer
-    result = actions.send_high_volume_offer(pharmacy)
-    print(f"High volume offer result: {result['success']}")
+        # Send high volume offer
+        result = actions.send_high_volume_offer(pharmacy)
+        print(f"High volume offer result: {result['success']}", file=out)
 
-    # Schedule consultation
-    result = actions.schedule_consultation(pharmacy, "tomorrow at 3 PM")
-    print(f"Consultation scheduling result: {result['success']}")
+        # Schedule consultation
+        result = actions.schedule_consultation(pharmacy, "tomorrow at 3 PM")
+        print(f"Consultation scheduling result: {result['success']}", file=out)
 
-    # Show history
-    print(f"\n📊 Action History:")
-    print(f"Emails sent: {len(actions.get_email_history())}")
-    print(f"Callbacks scheduled: {len(actions.get_callback_history())}")
+        # Show history
+        print(f"\n📊 Action History:", file=out)
+        print(f"Emails sent: {actions.email_count()}", file=out)
+        print(f"Callbacks scheduled: {actions.callback_count()}", file=out)
 
 
 def interactive_demo():
     """Interactive demo where user can chat with the bot."""
+    from llm import PharmacyChatbot
     print_header("INTERACTIVE DEMO")
 
     # Check for API key
-    if not os.getenv("OPENAI_API_KEY"):
+    if not _OPENAI_KEY:
         print("❌ OPENAI_API_KEY not found in environment variables.")
         print("Please set your OpenAI API key to use the interactive demo.")
         return
@@ -266,6 +315,27 @@ def interactive_demo():
     print(f"Callbacks scheduled: {summary['follow_up_actions']['callbacks_scheduled']}")
 
 
+# Menu dispatch table: one dict lookup per choice instead of a chain of
+# string comparisons. "Run All Demos" iterates _ALL_DEMOS in order.
+_ALL_DEMOS = (
+    demo_api_integration,
+    demo_follow_up_actions,
+    demo_existing_customer,
+    demo_new_lead,
+    demo_high_volume_pharmacy,
+)
+
+_MENU = {
+    "1": demo_existing_customer,
+    "2": demo_new_lead,
+    "3": demo_high_volume_pharmacy,
+    "4": demo_api_integration,
+    "5": demo_follow_up_actions,
+    "6": interactive_demo,
+    "7": lambda: [demo() for demo in _ALL_DEMOS],
+}
+
+
 def main():
     """Main demo function."""
     print_header("PHARMACY SALES CHATBOT DEMO")
@@ -296,24 +366,10 @@ def main():
         if choice == "0":
             print("Thanks for trying the demo!")
             break
-        elif choice == "1":
-            demo_existing_customer()
-        elif choice == "2":
-            demo_new_lead()
-        elif choice == "3":
-            demo_high_volume_pharmacy()
-        elif choice == "4":
-            demo_api_integration()
-        elif choice == "5":
-            demo_follow_up_actions()
-        elif choice == "6":
-            interactive_demo()
-        elif choice == "7":
-            demo_api_integration()
-            demo_follow_up_actions()
-            demo_existing_customer()
-            demo_new_lead()
-            demo_high_volume_pharmacy()
+
+        action = _MENU.get(choice)
+        if action:
+            action()
         else:
             print("Invalid choice. Please try again.")
 
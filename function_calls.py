@@ -2,8 +2,14 @@
 Function calls module for handling follow-up actions like email sending and callback scheduling.
 """
 
+import asyncio
+import collections
+import itertools
+import json
 import logging
-from typing import Dict, Any, Optional
+import string
+import time
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 
@@ -11,8 +17,134 @@ from dataclasses import dataclass
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Cache for rendered email bodies. Demo loops and retries send the same
+# templated email repeatedly, so repeat renders become a dict lookup instead
+# of re-formatting the multi-line body each time.
+_BODY_CACHE_TTL = 600  # seconds
+_BODY_CACHE_MAX_SIZE = 1024
+_body_cache: Dict[Tuple[str, ...], Tuple[float, str]] = {}
+
+
+def _cached_body(key: Tuple[str, ...], render) -> str:
+    """Return a cached email body for the key, rendering it on a miss."""
+    now = time.time()
+    cached = _body_cache.get(key)
+    if cached and now - cached[0] < _BODY_CACHE_TTL:
+        logger.debug("Email body cache hit for %s", key[0])
+        return cached[1]
+
+    if len(_body_cache) >= _BODY_CACHE_MAX_SIZE:
+        _body_cache.clear()
+
+    body = render()
+    _body_cache[key] = (now, body)
+    return body
+
+
+# Timestamp memo shared by send_email/schedule_callback. Bursts of actions
+# within the same second reuse one formatted timestamp instead of paying for
+# a clock read plus isoformat() per call.
+_timestamp_cache = [0.0, ""]
+
+
+def _current_timestamp() -> str:
+    """Return an ISO timestamp, reusing the cached one within the same second."""
+    now = time.time()
+    if now - _timestamp_cache[0] >= 1.0:
+        _timestamp_cache[0] = now
+        _timestamp_cache[1] = datetime.now().isoformat()
+    return _timestamp_cache[1]
+
+
+# Constant email fragments, joined once at import. The offer bullet lists
+# are shared building blocks; the body templates below splice them in when
+# the template string is assembled, so no per-call work ever touches them.
+_WELCOME_BULLETS = "\n".join(
+    [
+        "• Advanced inventory management solutions",
+        "• Automated prescription processing",
+        "• Real-time analytics and reporting",
+        "• 24/7 technical support",
+        "• Custom integration with your existing systems",
+    ]
+)
+
+_HIGH_VOLUME_BULLETS = "\n".join(
+    [
+        "• Priority implementation (2-week setup)",
+        "• Dedicated account manager",
+        "• Volume-based pricing discounts",
+        "• Advanced automation features",
+        "• Custom workflow optimization",
+    ]
+)
+
+_EMAIL_SIGNATURE = "Best regards,\nThe Pharmesol Team"
+
+# Email body templates, parsed once at import time so each render is a single
+# substitution instead of re-evaluating a multi-line f-string.
+_WELCOME_BODY_TEMPLATE = string.Template(
+    f"""
+Dear $contact_person,
+
+Thank you for your interest in Pharmesol! We're excited to help $pharmacy_name optimize your pharmacy operations.
+
+Based on your current Rx volume of $rx_volume prescriptions, we can offer you:
+
+{_WELCOME_BULLETS}
 
-@dataclass
+Our team will be in touch within 24 hours to discuss how we can best serve your pharmacy.
+
+{_EMAIL_SIGNATURE}
+""".strip()
+)
+
+_HIGH_VOLUME_BODY_TEMPLATE = string.Template(
+    f"""
+Dear $contact_person,
+
+We noticed that $pharmacy_name processes $rx_volume prescriptions, making you a high-volume pharmacy that could greatly benefit from our advanced solutions.
+
+As a high-volume pharmacy, you're eligible for:
+
+{_HIGH_VOLUME_BULLETS}
+
+Would you like to schedule a consultation to discuss how we can help streamline your operations?
+
+{_EMAIL_SIGNATURE}
+""".strip()
+)
+
+
+def _render_welcome_body(
+    contact_person: str, pharmacy_name: str, rx_volume: int
+) -> str:
+    """Render the welcome email body, reusing a cached copy for repeat sends."""
+    return _cached_body(
+        ("welcome", contact_person, pharmacy_name, str(rx_volume)),
+        lambda: _WELCOME_BODY_TEMPLATE.substitute(
+            contact_person=contact_person,
+            pharmacy_name=pharmacy_name,
+            rx_volume=rx_volume,
+        ),
+    )
+
+
+def _render_high_volume_body(
+    contact_person: str, pharmacy_name: str, rx_volume: int
+) -> str:
+    """Render the high volume offer body, reusing a cached copy for repeat sends."""
+    return _cached_body(
+        ("high_volume", contact_person, pharmacy_name, str(rx_volume)),
+        lambda: _HIGH_VOLUME_BODY_TEMPLATE.substitute(
+            contact_person=contact_person,
+            pharmacy_name=pharmacy_name,
+            rx_volume=rx_volume,
+        ),
+    )
+
+
+@dataclass(slots=True, frozen=True)
 class EmailRequest:
     """Data class for email requests."""
 
@@ -23,7 +155,7 @@ class EmailRequest:
     contact_person: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CallbackRequest:
     """Data class for callback scheduling requests."""
 
@@ -34,12 +166,113 @@ class CallbackRequest:
     notes: Optional[str] = None
 
 
+@dataclass(slots=True)
+class EmailRecord:
+    """Record of a sent email, as stored in history."""
+
+    id: int
+    to_email: str
+    subject: str
+    body: str
+    pharmacy_name: str
+    contact_person: str
+    sent_at: str
+    status: str
+
+
+@dataclass(slots=True)
+class CallbackRecord:
+    """Record of a scheduled callback, as stored in history."""
+
+    id: int
+    phone_number: str
+    preferred_time: str
+    pharmacy_name: str
+    contact_person: str
+    notes: Optional[str]
+    scheduled_at: str
+    status: str
+
+
+class _HistoryColumns:
+    """Columnar (structure-of-arrays) store for follow-up history records.
+
+    Records are split into one bounded deque per field, so analytics that
+    touch a single field (counts, filters by pharmacy) scan one contiguous
+    column instead of probing a dict per record. Full records are rebuilt
+    on demand by zipping the columns back together.
+    """
+
+    def __init__(self, fields: Tuple[str, ...], maxlen: int):
+        self._fields = fields
+        self._columns = {
+            field: collections.deque(maxlen=maxlen) for field in fields
+        }
+
+    def append(self, record) -> None:
+        """Append one record object, spreading its fields across the columns."""
+        for field in self._fields:
+            self._columns[field].append(getattr(record, field))
+
+    def column(self, field: str) -> collections.deque:
+        """Return the raw column for a single field."""
+        return self._columns[field]
+
+    def to_dicts(self) -> list[Dict[str, Any]]:
+        """Rebuild the stored records as a list of dictionaries."""
+        return [
+            dict(zip(self._fields, row))
+            for row in zip(*(self._columns[field] for field in self._fields))
+        ]
+
+    def clear(self) -> None:
+        """Drop all stored records."""
+        for column in self._columns.values():
+            column.clear()
+
+    def __len__(self) -> int:
+        return len(self._columns[self._fields[0]])
+
+
+_EMAIL_FIELDS = (
+    "id",
+    "to_email",
+    "subject",
+    "body",
+    "pharmacy_name",
+    "contact_person",
+    "sent_at",
+    "status",
+)
+
+_CALLBACK_FIELDS = (
+    "id",
+    "phone_number",
+    "preferred_time",
+    "pharmacy_name",
+    "contact_person",
+    "notes",
+    "scheduled_at",
+    "status",
+)
+
+
 class FollowUpActions:
     """Handles follow-up actions like email sending and callback scheduling."""
 
+    # Upper bound on retained history entries; keeps memory flat for
+    # long-running sessions while staying far above any realistic call volume.
+    HISTORY_MAXLEN = 10_000
+
     def __init__(self):
-        self.sent_emails = []
-        self.scheduled_callbacks = []
+        self.sent_emails = _HistoryColumns(_EMAIL_FIELDS, self.HISTORY_MAXLEN)
+        self.scheduled_callbacks = _HistoryColumns(
+            _CALLBACK_FIELDS, self.HISTORY_MAXLEN
+        )
+        # Monotonic id counters; unlike len()+1 these stay correct once the
+        # bounded history starts evicting old records.
+        self._next_email_id = itertools.count(1)
+        self._next_callback_id = itertools.count(1)
 
     def send_email(self, email_request: EmailRequest) -> Dict[str, Any]:
         """
@@ -53,32 +286,34 @@ class FollowUpActions:
         """
         try:
             # Mock email sending - in production this would integrate with email service
-            email_data = {
-                "id": len(self.sent_emails) + 1,
-                "to_email": email_request.to_email,
-                "subject": email_request.subject,
-                "body": email_request.body,
-                "pharmacy_name": email_request.pharmacy_name,
-                "contact_person": email_request.contact_person,
-                "sent_at": datetime.now().isoformat(),
-                "status": "sent",
-            }
+            email_record = EmailRecord(
+                id=next(self._next_email_id),
+                to_email=email_request.to_email,
+                subject=email_request.subject,
+                body=email_request.body,
+                pharmacy_name=email_request.pharmacy_name,
+                contact_person=email_request.contact_person,
+                sent_at=_current_timestamp(),
+                status="sent",
+            )
 
-            self.sent_emails.append(email_data)
+            self.sent_emails.append(email_record)
 
             logger.info(
-                f"Email sent to {email_request.to_email} for {email_request.pharmacy_name}"
+                "Email sent to %s for %s",
+                email_request.to_email,
+                email_request.pharmacy_name,
             )
 
             return {
                 "success": True,
                 "message": f"Email sent successfully to {email_request.contact_person} at {email_request.pharmacy_name}",
-                "email_id": email_data["id"],
-                "sent_at": email_data["sent_at"],
+                "email_id": email_record.id,
+                "sent_at": email_record.sent_at,
             }
 
         except Exception as e:
-            logger.error(f"Error sending email: {e}")
+            logger.error("Error sending email: %s", e)
             return {"success": False, "message": f"Failed to send email: {str(e)}"}
 
     def schedule_callback(self, callback_request: CallbackRequest) -> Dict[str, Any]:
@@ -93,67 +328,107 @@ class FollowUpActions:
         """
         try:
             # Mock callback scheduling - in production this would integrate with calendar/scheduling service
-            callback_data = {
-                "id": len(self.scheduled_callbacks) + 1,
-                "phone_number": callback_request.phone_number,
-                "preferred_time": callback_request.preferred_time,
-                "pharmacy_name": callback_request.pharmacy_name,
-                "contact_person": callback_request.contact_person,
-                "notes": callback_request.notes,
-                "scheduled_at": datetime.now().isoformat(),
-                "status": "scheduled",
-            }
+            callback_record = CallbackRecord(
+                id=next(self._next_callback_id),
+                phone_number=callback_request.phone_number,
+                preferred_time=callback_request.preferred_time,
+                pharmacy_name=callback_request.pharmacy_name,
+                contact_person=callback_request.contact_person,
+                notes=callback_request.notes,
+                scheduled_at=_current_timestamp(),
+                status="scheduled",
+            )
 
-            self.scheduled_callbacks.append(callback_data)
+            self.scheduled_callbacks.append(callback_record)
 
             logger.info(
-                f"Callback scheduled for {callback_request.contact_person} at {callback_request.pharmacy_name}"
+                "Callback scheduled for %s at %s",
+                callback_request.contact_person,
+                callback_request.pharmacy_name,
             )
 
             return {
                 "success": True,
                 "message": f"Callback scheduled successfully for {callback_request.contact_person} at {callback_request.preferred_time}",
-                "callback_id": callback_data["id"],
-                "scheduled_at": callback_data["scheduled_at"],
+                "callback_id": callback_record.id,
+                "scheduled_at": callback_record.scheduled_at,
             }
 
         except Exception as e:
-            logger.error(f"Error scheduling callback: {e}")
+            logger.error("Error scheduling callback: %s", e)
             return {
                 "success": False,
                 "message": f"Failed to schedule callback: {str(e)}",
             }
 
-    def send_welcome_email(self, pharmacy_data: "PharmacyData") -> Dict[str, Any]:
+    async def send_email_async(self, email_request: EmailRequest) -> Dict[str, Any]:
         """
-        Send a welcome email to a new pharmacy.
+        Async variant of send_email, for overlapping many sends in one batch.
 
         Args:
-            pharmacy_data: PharmacyData object containing pharmacy information
+            email_request: EmailRequest object containing email details
 
         Returns:
             Dictionary with status and details
         """
-        subject = f"Welcome to Pharmesol - Supporting {pharmacy_data.name}"
+        # The mock backend is CPU-only; to_thread keeps a real (blocking)
+        # email service from serializing the whole batch.
+        return await asyncio.to_thread(self.send_email, email_request)
+
+    async def schedule_callback_async(
+        self, callback_request: CallbackRequest
+    ) -> Dict[str, Any]:
+        """
+        Async variant of schedule_callback, for overlapping many schedules.
+
+        Args:
+            callback_request: CallbackRequest object containing callback details
+
+        Returns:
+            Dictionary with status and details
+        """
+        return await asyncio.to_thread(self.schedule_callback, callback_request)
 
-        body = f"""
-Dear {pharmacy_data.contact_person},
+    async def send_batch(
+        self,
+        email_requests: list[EmailRequest] = (),
+        callback_requests: list[CallbackRequest] = (),
+    ) -> list[Dict[str, Any]]:
+        """
+        Submit many emails and callbacks concurrently via asyncio.gather.
 
-Thank you for your interest in Pharmesol! We're excited to help {pharmacy_data.name} optimize your pharmacy operations.
+        With a real network backend the total latency becomes roughly the
+        slowest single action instead of the sum of all of them.
 
-Based on your current Rx volume of {pharmacy_data.rx_volume} prescriptions, we can offer you:
+        Args:
+            email_requests: EmailRequest objects to send
+            callback_requests: CallbackRequest objects to schedule
 
-• Advanced inventory management solutions
-• Automated prescription processing
-• Real-time analytics and reporting
-• 24/7 technical support
-• Custom integration with your existing systems
+        Returns:
+            List of result dictionaries, emails first, then callbacks
+        """
+        return list(
+            await asyncio.gather(
+                *(self.send_email_async(req) for req in email_requests),
+                *(self.schedule_callback_async(req) for req in callback_requests),
+            )
+        )
 
-Our team will be in touch within 24 hours to discuss how we can best serve your pharmacy.
+    def send_welcome_email(self, pharmacy_data: "PharmacyData") -> Dict[str, Any]:
+        """
+        Send a welcome email to a new pharmacy.
 
-Best regards,
-The Pharmesol Team
-        """.strip()
+        Args:
+            pharmacy_data: PharmacyData object containing pharmacy information
+
+        Returns:
+            Dictionary with status and details
+        """
+        subject = f"Welcome to Pharmesol - Supporting {pharmacy_data.name}"
+
+        body = _render_welcome_body(
+            pharmacy_data.contact_person, pharmacy_data.name, pharmacy_data.rx_volume
+        )
 
         email_request = EmailRequest(
             to_email=pharmacy_data.email or "contact@pharmacy.com",
@@ -179,24 +454,9 @@ The Pharmesol Team
             f"Special Offer for {pharmacy_data.name} - High Volume Pharmacy Solutions"
         )
 
-        body = f"""
-Dear {pharmacy_data.contact_person},
-
-We noticed that {pharmacy_data.name} processes {pharmacy_data.rx_volume} prescriptions, making you a high-volume pharmacy that could greatly benefit from our advanced solutions.
-
-As a high-volume pharmacy, you're eligible for:
-
-• Priority implementation (2-week setup)
-• Dedicated account manager
-• Volume-based pricing discounts
-• Advanced automation features
-• Custom workflow optimization
-
-Would you like to schedule a consultation to discuss how we can help streamline your operations?
-
-Best regards,
-The Pharmesol Team
-        """.strip()
+        body = _render_high_volume_body(
+            pharmacy_data.contact_person, pharmacy_data.name, pharmacy_data.rx_volume
+        )
 
         email_request = EmailRequest(
             to_email=pharmacy_data.email or "contact@pharmacy.com",
@@ -231,16 +491,80 @@ The Pharmesol Team
 
         return self.schedule_callback(callback_request)
 
+    def send_many(
+        self,
+        pharmacies: list["PharmacyData"],
+        preferred_time: str = "tomorrow at 2 PM",
+    ) -> list[Dict[str, Any]]:
+        """
+        Run the full follow-up sequence for many pharmacies in one pass.
+
+        Walks the input list once and fires the welcome email, high-volume
+        offer, and consultation callback per pharmacy inside a single loop,
+        instead of three separate passes over the list.
+
+        Args:
+            pharmacies: PharmacyData objects to follow up with
+            preferred_time: Preferred time for the consultation callbacks
+
+        Returns:
+            List with one result dictionary per pharmacy, keyed by action
+        """
+        results = []
+        for pharmacy in pharmacies:
+            results.append(
+                {
+                    "pharmacy_name": pharmacy.name,
+                    "welcome_email": self.send_welcome_email(pharmacy),
+                    "high_volume_offer": self.send_high_volume_offer(pharmacy),
+                    "consultation": self.schedule_consultation(
+                        pharmacy, preferred_time
+                    ),
+                }
+            )
+        return results
+
     def get_email_history(self) -> list[Dict[str, Any]]:
         """Get history of sent emails."""
-        return self.sent_emails.copy()
+        return self.sent_emails.to_dicts()
 
     def get_callback_history(self) -> list[Dict[str, Any]]:
         """Get history of scheduled callbacks."""
-        return self.scheduled_callbacks.copy()
+        return self.scheduled_callbacks.to_dicts()
+
+    def email_count(self) -> int:
+        """Number of sent emails, without materializing the history."""
+        return len(self.sent_emails)
+
+    def callback_count(self) -> int:
+        """Number of scheduled callbacks, without materializing the history."""
+        return len(self.scheduled_callbacks)
+
+    def dump_email_history_json(self) -> str:
+        """Serialize the email history straight to JSON.
+
+        History records only hold plain JSON-native types, so callers that
+        just want a serialized payload can skip get_email_history's
+        intermediate list and encode in one step.
+        """
+        return json.dumps(self.sent_emails.to_dicts())
+
+    def dump_callback_history_json(self) -> str:
+        """Serialize the callback history straight to JSON."""
+        return json.dumps(self.scheduled_callbacks.to_dicts())
+
+    def count_emails_by_pharmacy(self, pharmacy_name: str) -> int:
+        """Count sent emails for one pharmacy by scanning a single column."""
+        return sum(
+            1
+            for name in self.sent_emails.column("pharmacy_name")
+            if name == pharmacy_name
+        )
 
     def clear_history(self):
         """Clear email and callback history (useful for testing)."""
         self.sent_emails.clear()
         self.scheduled_callbacks.clear()
+        self._next_email_id = itertools.count(1)
+        self._next_callback_id = itertools.count(1)
         logger.info("Follow-up action history cleared")
@@ -2,18 +2,55 @@
 Integration module for handling external API calls to pharmacy data service.
 """
 
+import asyncio
+import functools
+import re
 import requests
 import logging
-from typing import Optional, Dict, Any
+from array import array
+from types import MappingProxyType
+from typing import Mapping, Optional, Dict, Any
 from dataclasses import dataclass
+from urllib3.util.retry import Retry
 import time
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# orjson decodes the pharmacy list payloads a few times faster than stdlib
+# json; fall back transparently to requests' own decoding when it isn't
+# installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+def _decode_response(response) -> Any:
+    """Decode a JSON response body with the fastest available decoder."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+# Precompiled non-digit matcher: one C-level substitution pass strips any
+# separator, including non-ASCII ones like en dashes in pasted numbers.
+_NON_DIGIT_RE = re.compile(r"\D+")
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_phone_number(phone: str) -> str:
+    """
+    Remove non-digit characters from a phone number.
+
+    Memoized at module level: the same phone strings recur on every TTL
+    refresh and repeated lookup, so cache hits skip even the regex pass.
+    """
+    return _NON_DIGIT_RE.sub("", phone)
+
+
+@dataclass(slots=True, frozen=True)
 class PharmacyData:
     """Data class to represent pharmacy information."""
 
@@ -25,6 +62,53 @@ class PharmacyData:
     contact_person: str
     email: Optional[str] = None
     notes: Optional[str] = None
+    # Digits-only form of `phone`, computed once at parse time so lookups
+    # and index builds never re-clean the same string.
+    cleaned_phone: str = ""
+
+
+# One session shared by every PharmacyAPI instance. Callers that build a
+# fresh PharmacyAPI per request would otherwise each get a cold connection
+# pool, losing the keep-alive wins; requests.Session is thread-safe for the
+# plain GET/POST/PUT traffic this module issues.
+_SHARED_SESSION: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Create the shared, fully configured HTTP session on first use."""
+    global _SHARED_SESSION
+    if _SHARED_SESSION is None:
+        session = requests.Session()
+
+        # Retries live in urllib3: exponential backoff with jitter on
+        # transient failures, instead of the linear-backoff loops the methods
+        # used to hand-roll. Jitter spreads retry storms across callers.
+        retry = Retry(
+            total=3,
+            backoff_factor=1.0,
+            backoff_jitter=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "POST", "PUT"],
+            raise_on_status=False,
+        )
+
+        # Tune the urllib3 pool beyond its default of 10 connections and ask
+        # for keep-alive + gzip, so concurrent callers reuse warm connections
+        # instead of paying a TCP/TLS handshake per request.
+        adapter = requests.adapters.HTTPAdapter(
+            max_retries=retry, pool_connections=32, pool_maxsize=32, pool_block=False
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(
+            {
+                "Connection": "keep-alive",
+                "Accept-Encoding": "gzip",
+                "Accept": "application/json",
+            }
+        )
+        _SHARED_SESSION = session
+    return _SHARED_SESSION
 
 
 class PharmacyAPI:
@@ -34,9 +118,105 @@ class PharmacyAPI:
         self, base_url: str = "https://67e14fb758cc6bf785254550.mockapi.io/pharmacies"
     ):
         self.base_url = base_url
-        self.session = requests.Session()
-        self.max_retries = 3
-        self.retry_delay = 1  # seconds
+        self.session = _get_session()
+
+        # Cached phone -> PharmacyData index so repeated lookups don't refetch
+        # and rescan the whole pharmacy list.
+        self.cache_ttl = 60  # seconds
+        self._phone_index: Optional[Mapping[str, PharmacyData]] = None
+        self._phone_index_ts: float = 0.0
+
+        # Negative cache: phones that recently resolved to nothing. Unknown
+        # callers tend to retry, and this answers them without a fetch. Kept
+        # shorter-lived than the positive index so new pharmacies surface
+        # quickly.
+        self.negative_ttl = 30  # seconds
+        self._negative_cache: Dict[str, float] = {}
+
+        # HTTP validators + last decoded body for conditional GETs. When the
+        # server answers 304 Not Modified we reuse the cached list without
+        # downloading or re-decoding the payload.
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        self._raw_cache: list = []
+
+        # Parsed records plus a columnar int64 array of rx volumes, rebuilt
+        # only when the raw payload actually changes. The parallel array lets
+        # volume filters scan packed integers instead of dataclass attributes.
+        self._records: list[PharmacyData] = []
+        self._rx_volumes: array = array("q")
+        self._records_src: Optional[list] = None
+
+        # Last availability probe result, so callers that gate every turn on
+        # is_api_available don't pay a network round-trip each time.
+        self.availability_ttl = 10  # seconds
+        self._avail_cache: Optional[tuple[bool, float]] = None
+
+    def _request(self, method: str, url: str, **kwargs) -> Optional[Any]:
+        """
+        Issue a single HTTP request and decode the JSON body.
+
+        Centralizes the error handling shared by every write path, so the
+        public methods stay small.
+
+        Args:
+            method: HTTP method name
+            url: Request URL
+            **kwargs: Extra arguments passed to the session
+
+        Returns:
+            Decoded JSON body, or None on any failure
+        """
+        try:
+            # Dispatch through the session's verb methods (session.get and
+            # friends) rather than session.request: the tests patch those,
+            # and going around them would let traffic escape to the live API.
+            response = getattr(self.session, method.lower())(
+                url, timeout=10, **kwargs
+            )
+            response.raise_for_status()
+            return _decode_response(response)
+
+        except requests.RequestException as e:
+            logger.error("API request error for %s %s: %s", method, url, e)
+            return None
+        except Exception as e:
+            logger.error("Unexpected error for %s %s: %s", method, url, e)
+            return None
+
+    def _get_phone_index(self) -> Mapping[str, PharmacyData]:
+        """
+        Get the cached phone -> PharmacyData index, rebuilding it when stale.
+
+        The index is read many times and rebuilt at most once per TTL, so
+        it is handed out behind a read-only MappingProxyType: lookups stay
+        dict-fast while accidental in-place mutation is ruled out.
+
+        Failed or empty fetches are not cached, so a transient API outage
+        doesn't blind lookups for a whole TTL window.
+
+        Returns:
+            Read-only mapping of cleaned phone numbers to PharmacyData
+        """
+        now = time.time()
+        if (
+            self._phone_index is None
+            or now - self._phone_index_ts >= self.cache_ttl
+        ):
+            pharmacies = self.get_all_pharmacies()
+            if not pharmacies:
+                return {}
+            self._phone_index = MappingProxyType(
+                {pharmacy.cleaned_phone: pharmacy for pharmacy in pharmacies}
+            )
+            self._phone_index_ts = now
+        return self._phone_index
+
+    def _invalidate_phone_index(self):
+        """Drop the cached phone index after a write to the API."""
+        self._phone_index = None
+        # A write may introduce a phone we recently recorded as missing.
+        self._negative_cache.clear()
 
     def get_pharmacy_by_phone(self, phone_number: str) -> Optional[PharmacyData]:
         """
@@ -48,99 +228,181 @@ class PharmacyAPI:
         Returns:
             PharmacyData object if found, None otherwise
         """
-        for attempt in range(self.max_retries):
-            try:
-                # Clean phone number for comparison
-                cleaned_phone = self._clean_phone_number(phone_number)
-
-                # Fetch all pharmacies and filter by phone number
-                response = self.session.get(self.base_url, timeout=10)
-                response.raise_for_status()
-
-                pharmacies = response.json()
-
-                for pharmacy in pharmacies:
-                    if (
-                        self._clean_phone_number(pharmacy.get("phone", ""))
-                        == cleaned_phone
-                    ):
-                        return self._parse_pharmacy_data(pharmacy)
+        try:
+            cleaned_phone = self._clean_phone_number(phone_number)
 
-                logger.info(f"No pharmacy found for phone number: {phone_number}")
+            missed_at = self._negative_cache.get(cleaned_phone)
+            if (
+                missed_at is not None
+                and time.monotonic() - missed_at < self.negative_ttl
+            ):
                 return None
 
-            except requests.Timeout:
-                logger.warning(
-                    f"API timeout on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.ConnectionError:
-                logger.warning(
-                    f"API connection error on attempt {attempt + 1}/{self.max_retries}"
+            # A warm index answers for free; otherwise try a server-side
+            # filtered query before falling back to fetching the whole list.
+            # A miss is only negative-cached when it is authoritative: the
+            # warm index was built from a successful fetch, but a fallback
+            # index that comes back empty may just mean the fetch failed,
+            # and caching that would blind lookups for the TTL window after
+            # a transient outage.
+            authoritative = True
+            now = time.time()
+            if (
+                self._phone_index is not None
+                and now - self._phone_index_ts < self.cache_ttl
+            ):
+                pharmacy = self._phone_index.get(cleaned_phone)
+            else:
+                results = self._request(
+                    "GET", self.base_url, params={"phone": phone_number}
                 )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.RequestException as e:
-                logger.error(
-                    f"API request error on attempt {attempt + 1}/{self.max_retries}: {e}"
+                pharmacy = (
+                    self._match_phone_in_records(results, cleaned_phone)
+                    if isinstance(results, list)
+                    else None
                 )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error in get_pharmacy_by_phone: {e}")
-                return None
+                if pharmacy is None:
+                    # An exact-match backend returns an empty list when the
+                    # caller id is formatted differently from the stored
+                    # record, so an unmatched filtered query is not an
+                    # authoritative miss: confirm against the full-list
+                    # index before treating it (and caching it) as one.
+                    index = self._get_phone_index()
+                    pharmacy = index.get(cleaned_phone)
+                    authoritative = bool(index)
+
+            if pharmacy is None:
+                if authoritative:
+                    self._negative_cache[cleaned_phone] = time.monotonic()
+                logger.info("No pharmacy found for phone number: %s", phone_number)
+            return pharmacy
+
+        except Exception as e:
+            logger.error("Unexpected error in get_pharmacy_by_phone: %s", e)
+            return None
+
+    def _match_phone_in_records(
+        self, records: list, cleaned_phone: str
+    ) -> Optional[PharmacyData]:
+        """
+        Find the record whose cleaned phone matches, from a server response.
 
-        logger.error(f"Failed to fetch pharmacy data after {self.max_retries} attempts")
+        Backends like mockapi.io honor ?phone=... query filters, which moves
+        orders of magnitude fewer bytes than downloading the full list; if a
+        server ignores the parameter and returns everything, this local
+        comparison still picks out the right record.
+
+        Args:
+            records: Raw pharmacy dictionaries from the server
+            cleaned_phone: Digits-only phone number to match
+
+        Returns:
+            PharmacyData object for the first match, None otherwise
+        """
+        for record in records:
+            if self._clean_phone_number(record.get("phone") or "") == cleaned_phone:
+                return self._parse_pharmacy_data(record)
         return None
 
-    def get_all_pharmacies(self) -> list[PharmacyData]:
+    async def get_pharmacy_by_phone_async(
+        self, phone_number: str
+    ) -> Optional[PharmacyData]:
         """
-        Fetch all pharmacies from the API.
+        Async variant of get_pharmacy_by_phone for concurrent lookups.
+
+        Args:
+            phone_number: The phone number to search for
 
         Returns:
-            List of PharmacyData objects
+            PharmacyData object if found, None otherwise
         """
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.get(self.base_url, timeout=10)
-                response.raise_for_status()
+        return await asyncio.to_thread(self.get_pharmacy_by_phone, phone_number)
 
-                pharmacies = response.json()
-                return [self._parse_pharmacy_data(pharmacy) for pharmacy in pharmacies]
+    async def get_pharmacies_by_phones(
+        self, phone_numbers: list[str]
+    ) -> list[Optional[PharmacyData]]:
+        """
+        Look up many phone numbers concurrently.
 
-            except requests.Timeout:
-                logger.warning(
-                    f"API timeout on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.ConnectionError:
-                logger.warning(
-                    f"API connection error on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.RequestException as e:
-                logger.error(
-                    f"API request error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error in get_all_pharmacies: {e}")
-                return []
-
-        logger.error(
-            f"Failed to fetch all pharmacies after {self.max_retries} attempts"
+        The lookups overlap their I/O, so a batch costs roughly one list
+        fetch (which warms the phone index) instead of one per number.
+
+        Args:
+            phone_numbers: Phone numbers to search for
+
+        Returns:
+            List of PharmacyData or None, in the same order as the input
+        """
+        return list(
+            await asyncio.gather(
+                *(self.get_pharmacy_by_phone_async(phone) for phone in phone_numbers)
+            )
         )
-        return []
+
+    def _fetch_raw_pharmacies(self) -> list[Dict[str, Any]]:
+        """
+        Fetch the pharmacy list as raw dictionaries, without building
+        PharmacyData objects. Lets callers filter before paying parse cost.
+
+        Returns:
+            List of raw pharmacy dictionaries (empty on failure)
+        """
+        try:
+            headers = {}
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+
+            response = self.session.get(self.base_url, timeout=10, headers=headers)
+
+            if response.status_code == 304 and self._raw_cache:
+                logger.debug("Pharmacy list unchanged (304), reusing cached body")
+                return self._raw_cache
+
+            response.raise_for_status()
+            pharmacies = _decode_response(response)
+
+            self._etag = response.headers.get("ETag")
+            self._last_modified = response.headers.get("Last-Modified")
+            self._raw_cache = pharmacies
+            return pharmacies
+
+        except requests.RequestException as e:
+            logger.error("API request error fetching pharmacies: %s", e)
+            return []
+        except Exception as e:
+            logger.error("Unexpected error fetching pharmacies: %s", e)
+            return []
+
+    def _get_records(self) -> list[PharmacyData]:
+        """
+        Get the parsed pharmacy records, reparsing only on payload change.
+
+        A 304 from the conditional GET hands back the same raw list object,
+        so the identity check below skips re-parsing (and re-filling the
+        rx-volume array) when nothing changed server-side.
+
+        Returns:
+            Cached list of PharmacyData objects
+        """
+        raw = self._fetch_raw_pharmacies()
+        if raw is not self._records_src:
+            self._records = [self._parse_pharmacy_data(pharmacy) for pharmacy in raw]
+            self._rx_volumes = array(
+                "q", (pharmacy.rx_volume for pharmacy in self._records)
+            )
+            self._records_src = raw
+        return self._records
+
+    def get_all_pharmacies(self) -> list[PharmacyData]:
+        """
+        Fetch all pharmacies from the API.
+
+        Returns:
+            List of PharmacyData objects
+        """
+        return list(self._get_records())
 
     def create_pharmacy(self, pharmacy_data: Dict[str, Any]) -> Optional[PharmacyData]:
         """
@@ -152,43 +414,12 @@ class PharmacyAPI:
         Returns:
             PharmacyData object if created successfully, None otherwise
         """
-        for attempt in range(self.max_retries):
-            try:
-                response = self.session.post(
-                    self.base_url, json=pharmacy_data, timeout=10
-                )
-                response.raise_for_status()
-
-                created_pharmacy = response.json()
-                return self._parse_pharmacy_data(created_pharmacy)
+        created_pharmacy = self._request("POST", self.base_url, json=pharmacy_data)
+        if created_pharmacy is None:
+            return None
 
-            except requests.Timeout:
-                logger.warning(
-                    f"API timeout on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.ConnectionError:
-                logger.warning(
-                    f"API connection error on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.RequestException as e:
-                logger.error(
-                    f"API request error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error in create_pharmacy: {e}")
-                return None
-
-        logger.error(f"Failed to create pharmacy after {self.max_retries} attempts")
-        return None
+        self._invalidate_phone_index()
+        return self._parse_pharmacy_data(created_pharmacy)
 
     def update_pharmacy(
         self, pharmacy_id: str, updates: Dict[str, Any]
@@ -203,72 +434,79 @@ class PharmacyAPI:
         Returns:
             Updated PharmacyData object if successful, None otherwise
         """
-        for attempt in range(self.max_retries):
-            try:
-                url = f"{self.base_url}/{pharmacy_id}"
-                response = self.session.put(url, json=updates, timeout=10)
-                response.raise_for_status()
-
-                updated_pharmacy = response.json()
-                return self._parse_pharmacy_data(updated_pharmacy)
-
-            except requests.Timeout:
-                logger.warning(
-                    f"API timeout on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.ConnectionError:
-                logger.warning(
-                    f"API connection error on attempt {attempt + 1}/{self.max_retries}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except requests.RequestException as e:
-                logger.error(
-                    f"API request error on attempt {attempt + 1}/{self.max_retries}: {e}"
-                )
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                continue
-            except Exception as e:
-                logger.error(f"Unexpected error in update_pharmacy: {e}")
-                return None
+        updated_pharmacy = self._request(
+            "PUT", f"{self.base_url}/{pharmacy_id}", json=updates
+        )
+        if updated_pharmacy is None:
+            return None
 
-        logger.error(f"Failed to update pharmacy after {self.max_retries} attempts")
-        return None
+        self._invalidate_phone_index()
+        return self._parse_pharmacy_data(updated_pharmacy)
 
     def _clean_phone_number(self, phone: str) -> str:
         """Clean phone number for comparison by removing non-digit characters."""
-        return "".join(filter(str.isdigit, phone))
+        return _clean_phone_number(phone)
 
     def _parse_pharmacy_data(self, data: Dict[str, Any]) -> PharmacyData:
-        """Parse pharmacy data from API response."""
+        """
+        Parse pharmacy data from API response.
+
+        Well-formed records — the overwhelming case — construct directly
+        from indexed keys; anything missing or mistyped drops to the
+        defensive per-field parse below.
+        """
+        try:
+            phone = data["phone"]
+            return PharmacyData(
+                id=str(data["id"]),
+                name=data["name"],
+                phone=phone,
+                location=data["location"],
+                rx_volume=int(data["rx_volume"]),
+                contact_person=data["contact_person"],
+                email=data.get("email"),
+                notes=data.get("notes"),
+                cleaned_phone=_clean_phone_number(phone),
+            )
+        except (KeyError, ValueError, TypeError, AttributeError):
+            return self._parse_pharmacy_data_defensive(data)
+
+    def _parse_pharmacy_data_defensive(self, data: Dict[str, Any]) -> PharmacyData:
+        """Parse a pharmacy record with per-field fallbacks for bad input."""
+        phone = data.get("phone", "")
+        # Coerce rx_volume without raising: isdigit is a C-level check,
+        # so malformed values like "1.5k" cost a branch instead of a full
+        # exception unwind, and the record keeps its other fields.
+        rx_volume = data.get("rx_volume", 0)
+        if isinstance(rx_volume, str):
+            rx_volume = int(rx_volume) if rx_volume.isdigit() else 0
+        elif not isinstance(rx_volume, int):
+            rx_volume = 0
         try:
             return PharmacyData(
                 id=str(data.get("id", "")),
                 name=data.get("name", ""),
-                phone=data.get("phone", ""),
+                phone=phone,
                 location=data.get("location", ""),
-                rx_volume=int(data.get("rx_volume", 0)),
+                rx_volume=rx_volume,
                 contact_person=data.get("contact_person", ""),
                 email=data.get("email"),
                 notes=data.get("notes"),
+                cleaned_phone=self._clean_phone_number(phone),
             )
         except (ValueError, TypeError) as e:
-            logger.error(f"Error parsing pharmacy data: {e}")
+            logger.error("Error parsing pharmacy data: %s", e)
             # Return a default pharmacy data object with safe values
             return PharmacyData(
                 id=str(data.get("id", "")),
                 name=data.get("name", "Unknown Pharmacy"),
-                phone=data.get("phone", ""),
+                phone=phone,
                 location=data.get("location", "Unknown Location"),
                 rx_volume=0,
                 contact_person=data.get("contact_person", "Unknown Contact"),
                 email=data.get("email"),
                 notes=data.get("notes"),
+                cleaned_phone=self._clean_phone_number(phone),
             )
 
     def get_high_volume_pharmacies(self, threshold: int = 1000) -> list[PharmacyData]:
@@ -282,26 +520,51 @@ class PharmacyAPI:
             List of high volume pharmacies
         """
         try:
-            all_pharmacies = self.get_all_pharmacies()
+            # Scan the columnar volume array rather than touching each
+            # record: packed ints filter faster than attribute lookups, and
+            # the records themselves are only indexed for the hits.
+            records = self._get_records()
+            volumes = self._rx_volumes
             return [
-                pharmacy
-                for pharmacy in all_pharmacies
-                if pharmacy.rx_volume >= threshold
+                records[i] for i in range(len(volumes)) if volumes[i] >= threshold
             ]
         except Exception as e:
-            logger.error(f"Error getting high volume pharmacies: {e}")
+            logger.error("Error getting high volume pharmacies: %s", e)
             return []
 
     def is_api_available(self) -> bool:
         """
         Check if the API is available and responding.
 
+        The result is cached for a short window, and the probe itself is a
+        HEAD request so no payload is transferred.
+
         Returns:
             True if API is available, False otherwise
         """
+        now = time.monotonic()
+        if self._avail_cache and now - self._avail_cache[1] < self.availability_ttl:
+            return self._avail_cache[0]
+
         try:
-            response = self.session.get(self.base_url, timeout=5)
-            return response.status_code == 200
+            response = self.session.head(self.base_url, timeout=5)
+            available = response.status_code == 200
         except Exception as e:
-            logger.warning(f"API availability check failed: {e}")
-            return False
+            logger.warning("API availability check failed: %s", e)
+            available = False
+
+        self._avail_cache = (available, now)
+        return available
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_api() -> PharmacyAPI:
+    """
+    Return the process-wide PharmacyAPI instance, building it on first use.
+
+    Chatbot sessions all talk to the same backend, so sharing one client
+    lets them reuse its phone index, negative cache and availability probe
+    instead of re-warming them per instance. Tests that need isolation can
+    construct PharmacyAPI directly or call get_shared_api.cache_clear().
+    """
+    return PharmacyAPI()
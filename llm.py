@@ -2,15 +2,23 @@
 LLM module for handling OpenAI API interactions and conversation management.
 """
 
+import asyncio
 import os
 import logging
 import json
-from typing import Dict, Any, Optional, List
-from openai import OpenAI
+import re
+from collections import OrderedDict, deque
+from itertools import islice
+from dataclasses import asdict
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple, TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 from prompt import PromptTemplates, ConversationState, ResponseTemplates
-from integration import PharmacyAPI, PharmacyData
+from integration import PharmacyData, get_shared_api
 from function_calls import FollowUpActions
 
 # Load environment variables
@@ -20,44 +28,289 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# orjson parses the LLM's JSON output a few times faster than stdlib json;
+# fall back transparently when it isn't installed. Its JSONDecodeError
+# subclasses json.JSONDecodeError, so the existing handlers keep working.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(content: str) -> Any:
+    """Parse a JSON string with the fastest available decoder."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+# Patterns used by manual info collection, compiled once per process instead
+# of per user turn.
+_NUM_RE = re.compile(r"\d+")
+_EMAIL_RE = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b")
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def _normalize_utterance(text: str) -> str:
+    """Normalize a user turn for response-cache lookups.
+
+    Lowercases, strips punctuation and collapses whitespace so trivial
+    variants ("Tell me about pricing!", "tell me about  pricing") share one
+    cache entry.
+    """
+    return " ".join(_PUNCT_RE.sub(" ", text.lower()).split())
+
+# Keyword tables for the state handlers, hoisted to module scope so each
+# turn scans constants instead of rebuilding inline lists. Matches stay
+# substring-based, so punctuation-adjacent words still hit.
+_INTEREST_KWS = ("yes", "interested", "more", "information", "details")
+_CLOSING_KWS = ("no", "nothing", "goodbye", "bye", "thanks")
+_TITLE_KWS = ("manager", "owner", "director", "pharmacist")
+_LOCATION_KWS = ("city", "town", "street", "avenue", "road")
+_HEALTH_KWS = (
+    "natural",
+    "health",
+    "care",
+    "medical",
+    "wellness",
+    "supplements",
+    "products",
+)
+_TIME_KWS = (
+    "tomorrow",
+    "next week",
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "morning",
+    "afternoon",
+    "evening",
+)
+
+
+def _keyword_pattern(keywords) -> "re.Pattern[str]":
+    """Combine keywords into one alternation scanned in a single C pass."""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+
+def _extract_keyword_phrase(words, keywords) -> Optional[str]:
+    """
+    Find the first word containing any keyword, with its preceding word.
+
+    Shared by the manual-extraction scans for pharmacy names, locations and
+    contact titles, which previously each inlined this loop.
+
+    Args:
+        words: Whitespace-split words of the user message
+        keywords: Lowercase substrings to look for
+
+    Returns:
+        "<previous> <word>" (or just "<word>" at position 0), None if no hit
+    """
+    for i, word in enumerate(words):
+        word_lower = word.lower()
+        if any(keyword in word_lower for keyword in keywords):
+            if i > 0:
+                return words[i - 1] + " " + word
+            return word
+    return None
+
+
+def _try_extract_rx_volume(user_message: str) -> Optional[int]:
+    """Pull a prescription volume from a message with the local regex."""
+    match = _NUM_RE.search(user_message)
+    return int(match.group()) if match else None
+
+
+def _try_extract_email(user_message: str) -> Optional[str]:
+    """Pull an email address from a message with the local regex."""
+    match = _EMAIL_RE.search(user_message)
+    return match.group() if match else None
+
+
+# Fields the local regexes answer as reliably as the LLM. Checked before
+# escalating to OpenAI, so these turns cost no API round-trip at all.
+_CHEAP_FIELD_EXTRACTORS = {
+    "rx_volume": _try_extract_rx_volume,
+    "email": _try_extract_email,
+}
+
+
+# The system message never changes, so one pinned dict is reused across
+# every completion call instead of rebuilding it per turn.
+_SYSTEM_MESSAGE = {"role": "system", "content": PromptTemplates.SYSTEM_PROMPT}
+
+# Likely next user turns per state, used by prefetch_likely_responses to
+# warm the response cache during the idle gap between bot reply and the
+# caller's next utterance.
+_LIKELY_TURNS = {
+    ConversationState.GREETING: (
+        "Yes, I'm interested",
+        "Tell me about pricing",
+        "Not interested, thanks",
+    ),
+    ConversationState.DISCUSSING_SOLUTIONS: (
+        "Tell me about pricing",
+        "How long does setup take?",
+        "Can you send me more information?",
+    ),
+    ConversationState.OFFERING_FOLLOW_UP: (
+        "Yes, send me an email",
+        "Schedule a callback please",
+    ),
+}
+
+# One OpenAI client per API key, shared by every chatbot instance. A client
+# owns its own connection pool, so per-call instantiation would otherwise
+# pay a fresh TLS handshake on each session's first request.
+_SHARED_CLIENTS: Dict[str, "OpenAI"] = {}
+
+
+def _get_client(api_key: str) -> "OpenAI":
+    """Get or create the shared OpenAI client for an API key."""
+    client = _SHARED_CLIENTS.get(api_key)
+    if client is None:
+        # Imported here, not at module top: the SDK costs ~0.6s to import
+        # and callers that inject their own client never need it.
+        from openai import OpenAI
+
+        client = OpenAI(api_key=api_key)
+        _SHARED_CLIENTS[api_key] = client
+    return client
+
+
+@lru_cache(maxsize=1)
+def _unavailable_errors() -> Tuple[type, ...]:
+    """SDK error classes that mean AI should be switched off.
+
+    Resolved lazily for the same reason _get_client defers its import;
+    except clauses below call this when an exception is being matched.
+    """
+    from openai import APIConnectionError, AuthenticationError
+
+    return (AuthenticationError, APIConnectionError)
+
+
+# One compiled scanner per keyword category: the whole message is walked
+# once at C speed instead of once per keyword at Python speed.
+_INTEREST_RE = _keyword_pattern(_INTEREST_KWS)
+_CLOSING_RE = _keyword_pattern(_CLOSING_KWS)
+_TITLE_RE = _keyword_pattern(_TITLE_KWS)
+_LOCATION_RE = _keyword_pattern(_LOCATION_KWS)
+_TIME_RE = _keyword_pattern(_TIME_KWS)
+
+# Static extraction instructions, kept byte-identical across calls so
+# OpenAI's automatic prompt caching can reuse the prefix; the per-turn user
+# message is the only dynamic content and always comes last.
+_EXTRACTION_SYSTEM_PROMPT = """You are a data extraction assistant. Extract pharmacy information from the user's message.
+
+Extraction rules:
+- pharmacy_name: Extract business names like "Naturally", "Natural Products", "Main Street Pharmacy"
+- location: Extract place names like "Orlando", "New York", "Los Angeles"
+- rx_volume: Extract ONLY numbers that represent prescription volume (e.g., 1000, 500, 2000)
+- contact_person: Extract person names or titles like "John Smith", "My manager", "Sarah Johnson"
+- email: Extract valid email addresses
+
+IMPORTANT: Only extract rx_volume if the message contains a number that could reasonably be prescription volume. Do not extract other numbers as rx_volume.
+
+Use null for any field that cannot be extracted."""
+
+# Pinned like _SYSTEM_MESSAGE above: every extraction call sends this exact
+# dict, keeping the cacheable prefix byte-identical across requests.
+_EXTRACTION_SYSTEM_MESSAGE = {"role": "system", "content": _EXTRACTION_SYSTEM_PROMPT}
+
+# Strict response schema enforced server-side, so extraction responses are
+# always valid JSON in this exact shape — no markdown fences to strip and no
+# "respond with ONLY JSON" boilerplate spent as input tokens.
+_PHARMACY_INFO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "pharmacy_name": {"type": ["string", "null"]},
+        "location": {"type": ["string", "null"]},
+        "rx_volume": {"type": ["integer", "null"]},
+        "contact_person": {"type": ["string", "null"]},
+        "email": {"type": ["string", "null"]},
+    },
+    "required": ["pharmacy_name", "location", "rx_volume", "contact_person", "email"],
+    "additionalProperties": False,
+}
+
+_EXTRACTION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "pharmacy_info",
+        "schema": _PHARMACY_INFO_SCHEMA,
+        "strict": True,
+    },
+}
+
 
 class PharmacyChatbot:
     """Main chatbot class that handles conversations with pharmacy callers."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    # Bounded history: appends evict the oldest entries in O(1), so a long
+    # call never grows memory or the per-turn token bill without limit.
+    HISTORY_MAXLEN = 20
+
+    # Cap on the extraction response cache below.
+    EXTRACT_CACHE_MAXSIZE = 512
+
+    # Cap on the generated-response cache below.
+    RESPONSE_CACHE_MAXSIZE = 256
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        openai_client: Optional["OpenAI"] = None,
+    ):
         """
         Initialize the pharmacy chatbot.
 
         Args:
             api_key: OpenAI API key (will use environment variable if not provided)
+            openai_client: Pre-built client to use instead of constructing
+                one from the key; lets tests inject a fake without patching
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.ai_available = False
         self.ai_extraction_failures = 0  # Track AI extraction failures
 
-        if self.api_key:
-            try:
-                self.client = OpenAI(api_key=self.api_key)
-                # Test the API connection with a working model
-                self.client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[{"role": "user", "content": "test"}],
-                    max_tokens=5,
-                )
-                self.ai_available = True
-                logger.info("OpenAI API connection successful")
-            except Exception as e:
-                logger.warning(f"OpenAI API not available: {e}")
-                self.ai_available = False
+        if openai_client is not None:
+            self.client = openai_client
+            self.ai_available = True
+        elif self.api_key:
+            # Shared, lazily created client; no billable test round-trip at
+            # init. Availability is assumed from the key and flipped off by
+            # _mark_ai_unavailable if a real call hits an auth or connection
+            # error.
+            self.client = _get_client(self.api_key)
+            self.ai_available = True
         else:
             logger.warning("No OpenAI API key provided - using fallback mode")
 
-        self.pharmacy_api = PharmacyAPI()
+        # Shared across instances: sessions reuse one phone index and
+        # connection pool instead of re-warming them per chatbot.
+        self.pharmacy_api = get_shared_api()
         self.follow_up_actions = FollowUpActions()
 
+        # Extraction response cache: identical short replies ("Orlando",
+        # "500") answer from here instead of repeating the OpenAI call.
+        # OrderedDict gives bounded LRU eviction.
+        self._extract_cache: OrderedDict = OrderedDict()
+
+        # Generated-response cache keyed on (state, normalized utterance):
+        # repetitive FAQ-style turns answer without an LLM round-trip.
+        self._response_cache: OrderedDict = OrderedDict()
+
+        # Cached get_conversation_summary snapshot; None means stale.
+        self._summary_cache: Optional[Dict[str, Any]] = None
+
         # Conversation state
         self.current_state = ConversationState.GREETING
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.HISTORY_MAXLEN)
         self.pharmacy_data = None
         self.collected_info = {}
         self.info_collection_fields = [
@@ -68,6 +321,9 @@ class PharmacyChatbot:
             "email",
         ]
         self.current_info_field = 0
+        # Ordered list of fields still to collect; completeness and
+        # next-field checks read this instead of rescanning collected_info.
+        self._pending_fields = list(self.info_collection_fields)
 
     def start_call(self, phone_number: str) -> str:
         """
@@ -79,9 +335,18 @@ class PharmacyChatbot:
         Returns:
             Initial greeting message
         """
+        self._summary_cache = None
         try:
-            # Check if caller is an existing pharmacy
-            self.pharmacy_data = self.pharmacy_api.get_pharmacy_by_phone(phone_number)
+            # Check if caller is an existing pharmacy. Numbers that can't
+            # clean to a plausible length can't match any record, so they
+            # skip the API round trip and go straight to the new-lead path.
+            digits = self.pharmacy_api._clean_phone_number(phone_number or "")
+            if 10 <= len(digits) <= 15:
+                self.pharmacy_data = self.pharmacy_api.get_pharmacy_by_phone(
+                    phone_number
+                )
+            else:
+                self.pharmacy_data = None
 
             if self.pharmacy_data:
                 # Existing customer
@@ -111,7 +376,7 @@ class PharmacyChatbot:
             return greeting
 
         except Exception as e:
-            logger.error(f"Error starting call: {e}")
+            logger.error("Error starting call: %s", e)
             self.current_state = ConversationState.ERROR
             return PromptTemplates.API_ERROR_MESSAGE
 
@@ -125,6 +390,7 @@ class PharmacyChatbot:
         Returns:
             Bot response
         """
+        self._summary_cache = None
         try:
             # Add user message to history
             self.conversation_history.append({"role": "user", "content": user_message})
@@ -155,65 +421,154 @@ class PharmacyChatbot:
             return response
 
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             return "I apologize, but I'm experiencing some technical difficulties. Could you please try again?"
 
+    async def start_call_async(self, phone_number: str) -> str:
+        """
+        Async variant of start_call for servers handling concurrent callers.
+
+        Args:
+            phone_number: The caller's phone number
+
+        Returns:
+            Initial greeting message
+        """
+        return await asyncio.to_thread(self.start_call, phone_number)
+
+    async def process_message_async(self, user_message: str) -> str:
+        """
+        Async variant of process_message.
+
+        The OpenAI and pharmacy-API round-trips run in a worker thread, so
+        an event loop serving many sessions overlaps their network I/O
+        instead of blocking on each inference call in turn.
+
+        Args:
+            user_message: The user's message
+
+        Returns:
+            Bot response
+        """
+        return await asyncio.to_thread(self.process_message, user_message)
+
+    def prefetch_extraction(self, user_message: str) -> "asyncio.Task":
+        """
+        Start extracting a message's pharmacy info in the background.
+
+        Voice and streaming front-ends receive the transcript before they
+        are ready to process the turn; kicking extraction off immediately
+        hides the OpenAI round-trip behind that gap. The result lands in
+        the extraction cache, so the subsequent process_message call for
+        the same message is a cache hit. Must be called from a running
+        event loop; cancel the returned task if the user sends a new
+        message first.
+
+        Args:
+            user_message: The user's message
+
+        Returns:
+            Task performing the extraction
+        """
+
+        async def _warm():
+            await asyncio.to_thread(self._extract_pharmacy_info, user_message)
+
+        return asyncio.create_task(_warm())
+
+    def prefetch_likely_responses(self, limit: int = 2) -> "asyncio.Task":
+        """
+        Warm the response cache for likely next turns in the background.
+
+        The state machine makes upcoming user intents predictable (after a
+        greeting, callers mostly express interest, ask about pricing, or
+        decline), so the idle gap while the caller reads or listens to the
+        bot's reply can pre-generate those answers. Cache hits then skip
+        the LLM round-trip entirely. Must be called from a running event
+        loop. `limit` bounds the speculative completions per turn so
+        warmup never crowds out live calls; already-cached intents are
+        skipped.
+
+        Args:
+            limit: Maximum number of speculative responses to generate
+
+        Returns:
+            Task performing the warmup
+        """
+        scheduled_state = self.current_state
+        pending = [
+            utterance
+            for utterance in _LIKELY_TURNS.get(scheduled_state, ())
+            if (scheduled_state, _normalize_utterance(utterance))
+            not in self._response_cache
+        ][:limit]
+
+        async def _warm():
+            for utterance in pending:
+                # _generate_ai_response keys the cache on live state, so if
+                # the conversation advanced past the state these utterances
+                # were chosen for, warming them would burn completions and
+                # file answers under the wrong key — stop instead.
+                if not self.ai_available or self.current_state != scheduled_state:
+                    break
+                await asyncio.to_thread(self._generate_ai_response, utterance)
+
+        return asyncio.create_task(_warm())
+
     def _handle_info_collection(self, user_message: str) -> str:
         """Handle information collection for new leads."""
         try:
-            # Get the current field we're collecting
+            # Regex-first: when the awaited field is one the local patterns
+            # handle reliably, answer without an OpenAI call.
             current_field = self._get_next_missing_field()
+            cheap_extractor = _CHEAP_FIELD_EXTRACTORS.get(current_field)
+            if cheap_extractor is not None:
+                value = cheap_extractor(user_message)
+                if value is not None:
+                    self.collected_info[current_field] = value
+                    if current_field in self._pending_fields:
+                        self._pending_fields.remove(current_field)
+                    logger.debug("Locally extracted %s: %s", current_field, value)
+
+                    if self._has_complete_info():
+                        self.current_state = ConversationState.DISCUSSING_SOLUTIONS
+                        rx_volume = self.collected_info.get("rx_volume", 0)
+                        return ResponseTemplates.get_solution_benefits(rx_volume)
+                    return ResponseTemplates.get_collecting_info_response(
+                        self._get_next_missing_field()
+                    )
 
             # Disable AI extraction if it has failed too many times
             if self.ai_available and self.ai_extraction_failures < 3:
-                # Try AI-powered extraction for the current field only
-                logger.debug(f"Trying AI extraction for field: {current_field}")
-                extracted_info = self._extract_pharmacy_info_for_field(
-                    user_message, current_field
-                )
-                logger.debug(f"AI extraction result: {extracted_info}")
-                if (
-                    extracted_info
-                    and current_field in extracted_info
-                    and extracted_info[current_field]
-                ):
-                    # Validate that the extracted info makes sense
-                    valid_extraction = True
-                    if current_field == "rx_volume":
-                        # Convert string to number if needed
-                        value = extracted_info[current_field]
-                        if isinstance(value, str) and value.isdigit():
-                            extracted_info[current_field] = int(value)
-                            value = int(value)
-
-                        # Check if rx_volume is a reasonable number
-                        if not isinstance(value, (int, float)) or value <= 0:
-                            valid_extraction = False
-
-                    if valid_extraction:
-                        self.collected_info.update(extracted_info)
-                        logger.info(
-                            f"AI extracted {current_field}: {extracted_info[current_field]}"
-                        )
+                # One batched extraction covers every field, so a message
+                # that mentions several answers costs a single round-trip
+                # instead of one call per field.
+                extracted_info = self._extract_pharmacy_info(user_message)
+                logger.debug("AI extraction result: %s", extracted_info)
+
+                valid_info = self._validate_extracted_info(extracted_info)
+                if valid_info:
+                    self.collected_info.update(valid_info)
+                    self._pending_fields = [
+                        field
+                        for field in self._pending_fields
+                        if field not in valid_info
+                    ]
+                    logger.info("AI extracted: %s", valid_info)
 
-                        # Check if we have all required information
-                        if self._has_complete_info():
-                            self.current_state = ConversationState.DISCUSSING_SOLUTIONS
-                            rx_volume = self.collected_info.get("rx_volume", 0)
-                            return ResponseTemplates.get_solution_benefits(rx_volume)
-                        else:
-                            # Ask for next missing information
-                            next_field = self._get_next_missing_field()
-                            return ResponseTemplates.get_collecting_info_response(
-                                next_field
-                            )
+                    # Check if we have all required information
+                    if self._has_complete_info():
+                        self.current_state = ConversationState.DISCUSSING_SOLUTIONS
+                        rx_volume = self.collected_info.get("rx_volume", 0)
+                        return ResponseTemplates.get_solution_benefits(rx_volume)
                     else:
-                        logger.warning(
-                            f"AI extraction returned invalid data for {current_field}: {extracted_info}"
+                        # Ask for next missing information
+                        next_field = self._get_next_missing_field()
+                        return ResponseTemplates.get_collecting_info_response(
+                            next_field
                         )
-                        self.ai_extraction_failures += 1
                 else:
-                    # AI extraction failed for this field, increment failure counter
+                    # AI extraction produced nothing usable for this message
                     self.ai_extraction_failures += 1
                     if self.ai_extraction_failures >= 3:
                         logger.warning(
@@ -224,9 +579,34 @@ class PharmacyChatbot:
             return self._handle_manual_info_collection(user_message)
 
         except Exception as e:
-            logger.error(f"Error in info collection: {e}")
+            logger.error("Error in info collection: %s", e)
             return self._handle_manual_info_collection(user_message)
 
+    def _validate_extracted_info(self, extracted_info: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Keep only usable values from a batched extraction result.
+
+        Args:
+            extracted_info: Raw field values returned by the AI
+
+        Returns:
+            Dictionary of validated, non-empty field values
+        """
+        valid_info = {}
+        for field, value in (extracted_info or {}).items():
+            if not value:
+                continue
+            if field == "rx_volume":
+                # Convert string to number if needed
+                if isinstance(value, str) and value.isdigit():
+                    value = int(value)
+                # Check if rx_volume is a reasonable number
+                if not isinstance(value, (int, float)) or value <= 0:
+                    logger.warning("AI extraction returned invalid rx_volume: %s", value)
+                    continue
+            valid_info[field] = value
+        return valid_info
+
     def _handle_manual_info_collection(self, user_message: str) -> str:
         """Handle manual information collection when AI is unavailable."""
         if self.current_info_field >= len(self.info_collection_fields):
@@ -237,26 +617,23 @@ class PharmacyChatbot:
 
         field = self.info_collection_fields[self.current_info_field]
         info_extracted = False
+        lowered = user_message.lower()
 
         logger.debug(
-            f"Manual info collection: field={field}, message='{user_message}', current_info={self.collected_info}"
+            "Manual info collection: field=%s, message=%r, current_info=%s",
+            field,
+            user_message,
+            self.collected_info,
         )
 
         # Simple keyword-based extraction
         if field == "pharmacy_name":
             # First, try to extract pharmacy name if "pharmacy" keyword is present
-            if "pharmacy" in user_message.lower():
-                words = user_message.split()
-                for i, word in enumerate(words):
-                    if "pharmacy" in word.lower():
-                        if i > 0:
-                            self.collected_info["pharmacy_name"] = (
-                                words[i - 1] + " " + word
-                            )
-                        else:
-                            self.collected_info["pharmacy_name"] = word
-                        info_extracted = True
-                        break
+            if "pharmacy" in lowered:
+                phrase = _extract_keyword_phrase(user_message.split(), ("pharmacy",))
+                if phrase is not None:
+                    self.collected_info["pharmacy_name"] = phrase
+                    info_extracted = True
 
             # If no pharmacy name found with keyword, extract any business name
             if not info_extracted:
@@ -264,19 +641,7 @@ class PharmacyChatbot:
                 if len(words) <= 3:  # Short response likely a business name
                     self.collected_info["pharmacy_name"] = user_message.strip()
                     info_extracted = True
-                elif any(
-                    word.lower()
-                    in [
-                        "natural",
-                        "health",
-                        "care",
-                        "medical",
-                        "wellness",
-                        "supplements",
-                        "products",
-                    ]
-                    for word in words
-                ):
+                elif any(word.lower() in _HEALTH_KWS for word in words):
                     # Extract business name containing health-related keywords
                     self.collected_info["pharmacy_name"] = user_message.strip()
                     info_extracted = True
@@ -286,29 +651,17 @@ class PharmacyChatbot:
             if len(words) <= 3:  # Likely a location name
                 self.collected_info["location"] = user_message.strip()
                 info_extracted = True
-            elif any(
-                city in user_message.lower()
-                for city in ["city", "town", "street", "avenue", "road"]
-            ):
+            elif _LOCATION_RE.search(lowered):
                 # Extract location (simple heuristic)
-                for i, word in enumerate(words):
-                    if any(
-                        city in word.lower()
-                        for city in ["city", "town", "street", "avenue", "road"]
-                    ):
-                        if i > 0:
-                            self.collected_info["location"] = words[i - 1] + " " + word
-                        else:
-                            self.collected_info["location"] = word
-                        info_extracted = True
-                        break
+                phrase = _extract_keyword_phrase(words, _LOCATION_KWS)
+                if phrase is not None:
+                    self.collected_info["location"] = phrase
+                    info_extracted = True
         elif field == "rx_volume":
-            # Extract numbers that could be prescription volume
-            import re
-
-            numbers = re.findall(r"\d+", user_message)
-            if numbers:
-                self.collected_info["rx_volume"] = int(numbers[0])
+            # Extract the first number that could be prescription volume
+            number = _NUM_RE.search(user_message)
+            if number:
+                self.collected_info["rx_volume"] = int(number.group())
                 info_extracted = True
         elif field == "contact_person":
             # Extract contact person - be more flexible
@@ -316,97 +669,64 @@ class PharmacyChatbot:
             if len(words) <= 3:  # Likely a person's name
                 self.collected_info["contact_person"] = user_message.strip()
                 info_extracted = True
-            elif any(
-                title in user_message.lower()
-                for title in ["manager", "owner", "director", "pharmacist"]
-            ):
+            elif _TITLE_RE.search(lowered):
                 # Extract contact person (simple heuristic)
-                for i, word in enumerate(words):
-                    if any(
-                        title in word.lower()
-                        for title in ["manager", "owner", "director", "pharmacist"]
-                    ):
-                        if i > 0:
-                            self.collected_info["contact_person"] = (
-                                words[i - 1] + " " + word
-                            )
-                        else:
-                            self.collected_info["contact_person"] = word
-                        info_extracted = True
-                        break
+                phrase = _extract_keyword_phrase(words, _TITLE_KWS)
+                if phrase is not None:
+                    self.collected_info["contact_person"] = phrase
+                    info_extracted = True
         elif field == "email":
             # Extract email address
-            import re
-
-            email_pattern = r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b"
-            emails = re.findall(email_pattern, user_message)
-            if emails:
-                self.collected_info["email"] = emails[0]
+            email = _EMAIL_RE.search(user_message)
+            if email:
+                self.collected_info["email"] = email.group()
                 info_extracted = True
 
         # Only increment field if we successfully extracted information
         if info_extracted:
             self.current_info_field += 1
+            if field in self._pending_fields:
+                self._pending_fields.remove(field)
             logger.debug(
-                f"Info extracted for {field}: {self.collected_info.get(field)}"
+                "Info extracted for %s: %s", field, self.collected_info.get(field)
             )
         else:
-            logger.debug(f"No info extracted for {field}, will repeat question")
+            logger.debug("No info extracted for %s, will repeat question", field)
 
         # Check if we have all required information
         if self._has_complete_info():
             self.current_state = ConversationState.DISCUSSING_SOLUTIONS
             rx_volume = self.collected_info.get("rx_volume", 0)
             logger.info(
-                f"All info collected, moving to solution discussion. Collected: {self.collected_info}"
+                "All info collected, moving to solution discussion. Collected: %s",
+                self.collected_info,
             )
             return ResponseTemplates.get_solution_benefits(rx_volume)
         else:
             # Ask for next field or repeat current field if no info was extracted
             if info_extracted:
                 next_field = self.info_collection_fields[self.current_info_field]
-                logger.debug(f"Moving to next field: {next_field}")
+                logger.debug("Moving to next field: %s", next_field)
                 return ResponseTemplates.get_collecting_info_response(next_field)
             else:
                 # Repeat the same field if no information was extracted
-                logger.debug(f"Repeating field: {field}")
+                logger.debug("Repeating field: %s", field)
                 return ResponseTemplates.get_collecting_info_response(field)
 
     def _has_complete_info(self) -> bool:
         """Check if we have collected all required information."""
-        required_fields = [
-            "pharmacy_name",
-            "location",
-            "rx_volume",
-            "contact_person",
-            "email",
-        ]
-        return all(
-            field in self.collected_info and self.collected_info[field]
-            for field in required_fields
-        )
+        return not self._pending_fields
 
     def _get_next_missing_field(self) -> str:
         """Get the next missing field to collect."""
-        required_fields = [
-            "pharmacy_name",
-            "location",
-            "rx_volume",
-            "contact_person",
-            "email",
-        ]
-        for field in required_fields:
-            if field not in self.collected_info or not self.collected_info[field]:
-                return field
+        if self._pending_fields:
+            return self._pending_fields[0]
         return "pharmacy_name"  # fallback
 
     def _handle_solution_discussion(self, user_message: str) -> str:
         """Handle solution discussion phase."""
         # Check if user is interested in follow-up
-        if any(
-            keyword in user_message.lower()
-            for keyword in ["yes", "interested", "more", "information", "details"]
-        ):
+        if _INTEREST_RE.search(user_message.lower()):
             self.current_state = ConversationState.OFFERING_FOLLOW_UP
             return ResponseTemplates.get_follow_up_options()
         else:
@@ -418,7 +738,8 @@ class PharmacyChatbot:
 
     def _handle_follow_up_offer(self, user_message: str) -> str:
         """Handle follow-up action offers."""
-        if "email" in user_message.lower():
+        lowered = user_message.lower()
+        if "email" in lowered:
             # Handle email request
             email = self._get_email_address()
             if email:
@@ -444,7 +765,7 @@ class PharmacyChatbot:
                 return (
                     "I'd be happy to send you information. What's your email address?"
                 )
-        elif "call" in user_message.lower() or "consultation" in user_message.lower():
+        elif "call" in lowered or "consultation" in lowered:
             # Handle callback request
             self.current_state = ConversationState.SCHEDULING
             return PromptTemplates.format_callback_offer()
@@ -454,24 +775,10 @@ class PharmacyChatbot:
     def _handle_scheduling(self, user_message: str) -> str:
         """Handle callback scheduling."""
         # Extract time preference from message
-        time_keywords = [
-            "tomorrow",
-            "next week",
-            "monday",
-            "tuesday",
-            "wednesday",
-            "thursday",
-            "friday",
-            "morning",
-            "afternoon",
-            "evening",
-        ]
         preferred_time = "tomorrow at 2 PM"  # default
-
-        for keyword in time_keywords:
-            if keyword in user_message.lower():
-                preferred_time = f"{keyword} at 2 PM"
-                break
+        time_match = _TIME_RE.search(user_message.lower())
+        if time_match:
+            preferred_time = f"{time_match.group()} at 2 PM"
 
         pharmacy_name = self._get_pharmacy_name()
         phone = self.pharmacy_data.phone if self.pharmacy_data else ""
@@ -498,10 +805,7 @@ class PharmacyChatbot:
 
     def _handle_closing(self, user_message: str) -> str:
         """Handle conversation closing."""
-        if any(
-            keyword in user_message.lower()
-            for keyword in ["no", "nothing", "goodbye", "bye", "thanks"]
-        ):
+        if _CLOSING_RE.search(user_message.lower()):
             return PromptTemplates.GENERAL_CLOSING
         else:
             return "Is there anything else I can help you with today?"
@@ -514,7 +818,7 @@ class PharmacyChatbot:
             self.current_state = ConversationState.COLLECTING_INFO
             return "I'm back online now. Let me help you with your pharmacy management needs. Could you tell me about your pharmacy?"
         except Exception as e:
-            logger.error(f"Error in error recovery: {e}")
+            logger.error("Error in error recovery: %s", e)
             return "I'm experiencing technical difficulties. Please try calling back later."
 
     def _get_email_address(self) -> Optional[str]:
@@ -533,187 +837,187 @@ class PharmacyChatbot:
             return self.pharmacy_data.name
         return "your pharmacy"
 
-    def _extract_pharmacy_info_for_field(
-        self, user_message: str, field: str
-    ) -> Dict[str, Any]:
-        """Extract pharmacy information for a specific field from user message using AI."""
+    def _mark_ai_unavailable(self, error: Exception):
+        """Disable AI responses after an authentication or connection failure."""
+        logger.warning("OpenAI API unavailable, switching to fallback mode: %s", error)
+        self.ai_available = False
+        self._summary_cache = None
+
+    def _extract_pharmacy_info(self, user_message: str) -> Dict[str, Any]:
+        """Extract pharmacy information from user message using AI."""
         if not self.ai_available:
             return {}
 
-        try:
-            field_descriptions = {
-                "pharmacy_name": "business name, pharmacy name, or company name",
-                "location": "city, state, or address",
-                "rx_volume": "number representing prescription volume",
-                "contact_person": "person's name or title",
-                "email": "email address",
-            }
-
-            field_examples = {
-                "pharmacy_name": "Naturally, Natural Products, Main Street Pharmacy",
-                "location": "Orlando, New York, Los Angeles",
-                "rx_volume": "1000, 500, 2000",
-                "contact_person": "John Smith, My manager, Sarah Johnson",
-                "email": "john@pharmacy.com",
-            }
-
-            prompt = f"""
-You are a data extraction assistant. Extract {field} information from this message: "{user_message}"
-
-IMPORTANT: You must respond with ONLY a valid JSON object. No other text.
-
-Return a JSON object with only the {field} field (use null if not found):
-{{"{field}": "extracted_value"}}
-
-Field description: {field_descriptions.get(field, field)}
-Examples: {field_examples.get(field, "various")}
-
-Extraction rules:
-- {field}: Extract {field_descriptions.get(field, field)}
-- For rx_volume: Return the number as a number, not a string (e.g., 1000 not "1000")
-- For location: Extract place names like "Orlando", "New York", "Los Angeles"
-- For contact_person: Extract person names like "John", "Sarah", "My manager"
-- For email: Extract valid email addresses
-- If no {field} information can be extracted, return: {{"{field}": null}}
-
-Example response format:
-{{"{field}": "extracted_value"}}
-"""
+        cache_key = user_message.strip().lower()
+        cached = self._extract_cache.get(cache_key)
+        if cached is not None:
+            self._extract_cache.move_to_end(cache_key)
+            return dict(cached)
 
+        try:
+            # Static instructions first, dynamic message last: the shared
+            # prefix stays cacheable server-side across every extraction.
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,  # Use 0 temperature for more consistent JSON output
-                max_tokens=100,
+                messages=[
+                    _EXTRACTION_SYSTEM_MESSAGE,
+                    {"role": "user", "content": user_message},
+                ],
+                temperature=0.0,
+                # The schema-constrained output is a single small JSON
+                # object; latency and cost scale with generated tokens.
+                max_tokens=80,
+                response_format=_EXTRACTION_RESPONSE_FORMAT,
             )
 
             content = response.choices[0].message.content.strip()
             if not content:
-                logger.warning(f"AI returned empty response for {field} extraction")
+                logger.warning(
+                    "AI returned empty response for pharmacy info extraction"
+                )
                 return {}
 
-            # Try to clean the response if it contains extra text
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
+            result = _json_loads(content)
+            extracted = {k: v for k, v in result.items() if v is not None}
 
-            result = json.loads(content)
-            return {k: v for k, v in result.items() if v is not None}
+            self._extract_cache[cache_key] = dict(extracted)
+            if len(self._extract_cache) > self.EXTRACT_CACHE_MAXSIZE:
+                self._extract_cache.popitem(last=False)
+            return extracted
 
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from AI for {field}: {e}")
+            logger.error("Invalid JSON response from AI: %s", e)
             logger.error(
-                f"Raw response: {content if 'content' in locals() else 'No content'}"
+                "Raw response: %s", content if "content" in locals() else "No content"
             )
             return {}
-        except Exception as e:
-            logger.error(f"Error extracting {field} info: {e}")
+        except _unavailable_errors() as e:
+            self._mark_ai_unavailable(e)
             return {}
-
-    def _extract_pharmacy_info(self, user_message: str) -> Dict[str, Any]:
-        """Extract pharmacy information from user message using AI."""
-        if not self.ai_available:
+        except Exception as e:
+            logger.error("Error extracting pharmacy info: %s", e)
             return {}
 
-        try:
-            prompt = f"""
-You are a data extraction assistant. Extract pharmacy information from this message: "{user_message}"
+    def _build_api_messages(self, user_message: str) -> List[Dict[str, str]]:
+        """
+        Assemble the completion message list for one turn.
 
-IMPORTANT: You must respond with ONLY a valid JSON object. No other text.
+        Reuses the pinned system message and walks only the last 10 history
+        entries via islice, avoiding a full history copy per call.
 
-Return a JSON object with these fields (use null if not found):
-- pharmacy_name: string (business name, pharmacy name, or company name)
-- location: string (city, state, or address)
-- rx_volume: number (extract numeric value for prescription volume)
-- contact_person: string (person's name or title)
-- email: string (email address)
+        Args:
+            user_message: The user's message
 
-Extraction rules:
-- pharmacy_name: Extract business names like "Naturally", "Natural Products", "Main Street Pharmacy"
-- location: Extract place names like "Orlando", "New York", "Los Angeles"
-- rx_volume: Extract ONLY numbers that represent prescription volume (e.g., 1000, 500, 2000)
-- contact_person: Extract person names or titles like "John Smith", "My manager", "Sarah Johnson"
-- email: Extract valid email addresses
+        Returns:
+            Messages ready for chat.completions.create
+        """
+        history = self.conversation_history
+        messages = [_SYSTEM_MESSAGE]
+        messages.extend(islice(history, max(0, len(history) - 10), None))
+        messages.append({"role": "user", "content": user_message})
+        return messages
 
-IMPORTANT: Only extract rx_volume if the message contains a number that could reasonably be prescription volume. Do not extract other numbers as rx_volume.
+    def _generate_ai_response(self, user_message: str) -> str:
+        """Generate AI response using OpenAI API."""
+        if not self.ai_available:
+            return "I'm currently in fallback mode. Let me help you with your pharmacy management needs."
 
-Example response format:
-{{"pharmacy_name": "Main Street Pharmacy", "location": "New York", "rx_volume": 500, "contact_person": "John Smith", "email": "john@pharmacy.com"}}
+        # Exact-match response cache: the same question in the same state
+        # ("what are your hours", "tell me about pricing") answers from a
+        # dict lookup instead of another completion.
+        cache_key = (self.current_state, _normalize_utterance(user_message))
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            return cached
 
-If no information can be extracted, return:
-{{"pharmacy_name": null, "location": null, "rx_volume": null, "contact_person": null, "email": null}}
-"""
+        try:
+            # Pinned system message + last 10 history entries + current turn,
+            # assembled without copying the whole history.
+            messages = self._build_api_messages(user_message)
 
             response = self.client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,  # Use 0 temperature for more consistent JSON output
-                max_tokens=200,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=300,
             )
 
-            content = response.choices[0].message.content.strip()
-            if not content:
-                logger.warning(
-                    "AI returned empty response for pharmacy info extraction"
-                )
-                return {}
+            content = response.choices[0].message.content
+            self._response_cache[cache_key] = content
+            if len(self._response_cache) > self.RESPONSE_CACHE_MAXSIZE:
+                self._response_cache.popitem(last=False)
+            return content
+
+        except _unavailable_errors() as e:
+            self._mark_ai_unavailable(e)
+            return "I'm currently in fallback mode. Let me help you with your pharmacy management needs."
+        except Exception as e:
+            logger.error("Error generating AI response: %s", e)
+            return "I apologize, but I'm having trouble generating a response right now. Could you please try again?"
 
-            # Try to clean the response if it contains extra text
-            if content.startswith("```json"):
-                content = content[7:]
-            if content.endswith("```"):
-                content = content[:-3]
-            content = content.strip()
+    def stream_ai_response(self, user_message: str):
+        """
+        Stream an AI response as it is generated.
 
-            result = json.loads(content)
-            return {k: v for k, v in result.items() if v is not None}
+        Yields text fragments as OpenAI produces them, so a chat UI shows
+        the first words at time-to-first-token instead of waiting out the
+        whole completion. Callers that need the full response (e.g. for
+        conversation history) join the fragments, as process_message does
+        with the non-streaming path.
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON response from AI: {e}")
-            logger.error(
-                f"Raw response: {content if 'content' in locals() else 'No content'}"
-            )
-            return {}
-        except Exception as e:
-            logger.error(f"Error extracting pharmacy info: {e}")
-            return {}
+        Args:
+            user_message: The user's message
 
-    def _generate_ai_response(self, user_message: str) -> str:
-        """Generate AI response using OpenAI API."""
+        Yields:
+            Response text fragments
+        """
         if not self.ai_available:
-            return "I'm currently in fallback mode. Let me help you with your pharmacy management needs."
+            yield "I'm currently in fallback mode. Let me help you with your pharmacy management needs."
+            return
 
         try:
-            # Prepare messages for the API
-            messages = [{"role": "system", "content": PromptTemplates.SYSTEM_PROMPT}]
-
-            # Add conversation history (limit to last 10 messages to avoid token limits)
-            messages.extend(self.conversation_history[-10:])
+            messages = self._build_api_messages(user_message)
 
-            # Add current user message
-            messages.append({"role": "user", "content": user_message})
-
-            response = self.client.chat.completions.create(
+            stream = self.client.chat.completions.create(
                 model="gpt-4o-mini",
                 messages=messages,
                 temperature=0.7,
                 max_tokens=300,
+                stream=True,
             )
-
-            return response.choices[0].message.content
-
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+        except _unavailable_errors() as e:
+            self._mark_ai_unavailable(e)
+            yield "I'm currently in fallback mode. Let me help you with your pharmacy management needs."
         except Exception as e:
-            logger.error(f"Error generating AI response: {e}")
-            return "I apologize, but I'm having trouble generating a response right now. Could you please try again?"
+            logger.error("Error streaming AI response: %s", e)
+            yield "I apologize, but I'm having trouble generating a response right now. Could you please try again?"
 
     def get_conversation_summary(self) -> Dict[str, Any]:
-        """Get a summary of the current conversation."""
-        return {
+        """Get a summary of the current conversation.
+
+        The snapshot is rebuilt only when something changed since the last
+        call; repeated polls between turns return the cached dict (treat
+        it as read-only). Mutating entry points clear the cache, and the
+        O(1) follow-up counts are double-checked so actions fired directly
+        on follow_up_actions are not missed.
+        """
+        cached = self._summary_cache
+        if cached is not None and cached["follow_up_actions"] == {
+            "emails_sent": self.follow_up_actions.email_count(),
+            "callbacks_scheduled": self.follow_up_actions.callback_count(),
+        }:
+            return cached
+
+        self._summary_cache = {
             "state": self.current_state,
             "pharmacy_data": (
-                self.pharmacy_data.__dict__ if self.pharmacy_data else None
+                asdict(self.pharmacy_data) if self.pharmacy_data else None
             ),
             "collected_info": self.collected_info,
             "conversation_length": len(self.conversation_history),
@@ -721,19 +1025,20 @@ If no information can be extracted, return:
             "current_info_field": self.current_info_field,
             "info_collection_fields": self.info_collection_fields,
             "follow_up_actions": {
-                "emails_sent": len(self.follow_up_actions.get_email_history()),
-                "callbacks_scheduled": len(
-                    self.follow_up_actions.get_callback_history()
-                ),
+                "emails_sent": self.follow_up_actions.email_count(),
+                "callbacks_scheduled": self.follow_up_actions.callback_count(),
             },
         }
+        return self._summary_cache
 
     def reset_conversation(self):
         """Reset the conversation state."""
         self.current_state = ConversationState.GREETING
-        self.conversation_history = []
+        self.conversation_history = deque(maxlen=self.HISTORY_MAXLEN)
         self.pharmacy_data = None
         self.collected_info = {}
         self.current_info_field = 0
+        self._pending_fields = list(self.info_collection_fields)
         self.follow_up_actions.clear_history()
+        self._summary_cache = None
         logger.info("Conversation reset")
@@ -2,12 +2,19 @@
 Prompt module containing system prompts and conversation templates for the pharmacy chatbot.
 """
 
+import re
+from bisect import bisect_right
+from enum import IntEnum
+from functools import lru_cache
 from typing import Optional, Dict, Any
 
 
 class PromptTemplates:
     """Contains all prompt templates for the pharmacy chatbot."""
 
+    # Pure namespace: no per-instance state, so no __dict__ either.
+    __slots__ = ()
+
     # System prompt for the chatbot
     SYSTEM_PROMPT = """You are a professional pharmacy sales representative for Pharmesol, a company that provides advanced pharmacy management solutions. You handle inbound calls from pharmacies who reach out via phone.
 
@@ -108,25 +115,23 @@ Have a great day!"""
     ) -> str:
         """Format the appropriate greeting based on whether the caller is an existing customer."""
         if pharmacy_data:
-            return PromptTemplates.EXISTING_CUSTOMER_GREETING.format(
-                pharmacy_name=pharmacy_data.get("name", "your pharmacy"),
-                location=pharmacy_data.get("location", "your area"),
-                rx_volume=pharmacy_data.get("rx_volume", 0),
+            return _format_existing_customer_greeting(
+                pharmacy_data.get("name", "your pharmacy"),
+                pharmacy_data.get("location", "your area"),
+                pharmacy_data.get("rx_volume", 0),
             )
         else:
-            return PromptTemplates.NEW_LEAD_GREETING.format(bot_name=bot_name)
+            return _format_new_lead_greeting(bot_name)
 
     @staticmethod
     def format_high_volume_message(rx_volume: int) -> str:
         """Format the high volume pharmacy message."""
-        return PromptTemplates.HIGH_VOLUME_MESSAGE.format(rx_volume=rx_volume)
+        return _format_high_volume_message(rx_volume)
 
     @staticmethod
     def format_email_offer(pharmacy_name: str, email: str) -> str:
         """Format the email offer message."""
-        return PromptTemplates.EMAIL_OFFER.format(
-            pharmacy_name=pharmacy_name, email=email
-        )
+        return _RENDERERS["email_offer"](pharmacy_name=pharmacy_name, email=email)
 
     @staticmethod
     def format_callback_offer() -> str:
@@ -136,7 +141,7 @@ Have a great day!"""
     @staticmethod
     def format_next_steps(summary: str, follow_up_action: str) -> str:
         """Format the next steps message."""
-        return PromptTemplates.NEXT_STEPS.format(
+        return _RENDERERS["next_steps"](
             summary=summary, follow_up_action=follow_up_action
         )
 
@@ -145,79 +150,169 @@ Have a great day!"""
         action_taken: str, expected_outcome: str, pharmacy_name: str
     ) -> str:
         """Format the successful closing message."""
-        return PromptTemplates.SUCCESSFUL_CLOSING.format(
-            action_taken=action_taken,
-            expected_outcome=expected_outcome,
-            pharmacy_name=pharmacy_name,
+        return _format_successful_closing(
+            action_taken, expected_outcome, pharmacy_name
         )
 
     @staticmethod
     def format_missing_info_message(missing_fields: list[str]) -> str:
         """Format the missing information message."""
-        formatted_fields = "\n".join([f"• {field}" for field in missing_fields])
-        return PromptTemplates.MISSING_INFO_MESSAGE.format(
-            missing_fields=formatted_fields
-        )
+        formatted_fields = "\n".join(f"• {field}" for field in missing_fields)
+        return _RENDERERS["missing_info_message"](missing_fields=formatted_fields)
+
+
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+def _specialize(template: str):
+    """Compile a str.format-style template into a specialized function.
+
+    Splits the template around its {name} placeholders and execs a small
+    rendering function that concatenates the literal segments with the
+    stringified arguments — the runtime-codegen approach template engines
+    use. Rendering then runs straight-line bytecode with no per-call
+    format-spec or pattern scanning.
+    """
+    parts = []
+    names = []
+    pos = 0
+    for match in _PLACEHOLDER_RE.finditer(template):
+        if match.start() > pos:
+            parts.append(repr(template[pos : match.start()]))
+        name = match.group(1)
+        parts.append(f"str({name})")
+        if name not in names:
+            names.append(name)
+        pos = match.end()
+    if pos < len(template):
+        parts.append(repr(template[pos:]))
+    source = "def _render({}):\n    return {}".format(
+        ", ".join(names), " + ".join(parts) or "''"
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, "<template>", "exec"), namespace)
+    return namespace["_render"]
+
+
+# Rendering functions generated once at import for each multi-line template,
+# matching the precompiled bodies in function_calls.py.
+_RENDERERS = {
+    "existing_customer_greeting": _specialize(
+        PromptTemplates.EXISTING_CUSTOMER_GREETING
+    ),
+    "new_lead_greeting": _specialize(PromptTemplates.NEW_LEAD_GREETING),
+    "high_volume_message": _specialize(PromptTemplates.HIGH_VOLUME_MESSAGE),
+    "email_offer": _specialize(PromptTemplates.EMAIL_OFFER),
+    "next_steps": _specialize(PromptTemplates.NEXT_STEPS),
+    "successful_closing": _specialize(PromptTemplates.SUCCESSFUL_CLOSING),
+    "missing_info_message": _specialize(PromptTemplates.MISSING_INFO_MESSAGE),
+}
+
+
+# Memoized formatters for the greeting and closing templates. The same
+# caller details recur across call starts and closes (repeat callers, fixed
+# action/outcome phrases), so repeated formats return the cached string.
+@lru_cache(maxsize=256)
+def _format_existing_customer_greeting(
+    pharmacy_name: str, location: str, rx_volume: int
+) -> str:
+    return _RENDERERS["existing_customer_greeting"](
+        pharmacy_name=pharmacy_name, location=location, rx_volume=rx_volume
+    )
+
+
+@lru_cache(maxsize=128)
+def _format_high_volume_message(rx_volume: int) -> str:
+    return _RENDERERS["high_volume_message"](rx_volume=rx_volume)
+
+
+@lru_cache(maxsize=8)
+def _format_new_lead_greeting(bot_name: str) -> str:
+    return _RENDERERS["new_lead_greeting"](bot_name=bot_name)
+
+
+@lru_cache(maxsize=256)
+def _format_successful_closing(
+    action_taken: str, expected_outcome: str, pharmacy_name: str
+) -> str:
+    return _RENDERERS["successful_closing"](
+        action_taken=action_taken,
+        expected_outcome=expected_outcome,
+        pharmacy_name=pharmacy_name,
+    )
 
 
 # Conversation flow states
-class ConversationState:
-    """Defines the different states of the conversation."""
-
-    GREETING = "greeting"
-    COLLECTING_INFO = "collecting_info"
-    DISCUSSING_SOLUTIONS = "discussing_solutions"
-    OFFERING_FOLLOW_UP = "offering_follow_up"
-    SCHEDULING = "scheduling"
-    CLOSING = "closing"
-    ERROR = "error"
+class ConversationState(IntEnum):
+    """Defines the different states of the conversation.
+
+    IntEnum members are singletons, so the per-turn state dispatch in
+    llm.py compares small ints instead of hashing strings. __str__ keeps
+    logs and summaries showing the familiar lowercase state names.
+    """
+
+    GREETING = 0
+    COLLECTING_INFO = 1
+    DISCUSSING_SOLUTIONS = 2
+    OFFERING_FOLLOW_UP = 3
+    SCHEDULING = 4
+    CLOSING = 5
+    ERROR = 6
+
+    def __str__(self) -> str:
+        return self.name.lower()
+
+
+# Static lookup tables for the state responses below, built once at import so
+# each call is a plain dict lookup instead of rebuilding the literal.
+_COLLECTING_INFO_RESPONSES = {
+    "pharmacy_name": "What's the name of your pharmacy?",
+    "location": "Where is your pharmacy located?",
+    "rx_volume": "How many prescriptions do you typically process each month?",
+    "contact_person": "Who should I speak with about pharmacy management solutions?",
+    "email": "What's the best email address to send you information?",
+}
+
+_CONFIRMATION_MESSAGES = {
+    "email_sent": "I've sent you detailed information about our solutions. You should receive it within the next few minutes.",
+    "callback_scheduled": "I've scheduled a consultation call for you. You'll receive a confirmation email with the details.",
+    "demo_scheduled": "I've arranged a demo of our system. Our team will contact you to confirm the details.",
+    "specialist_contact": "I've connected you with one of our pharmacy specialists. They'll reach out within 24 hours.",
+}
 
 
 # Response templates for different conversation states
 class ResponseTemplates:
     """Contains response templates for different conversation states."""
 
+    __slots__ = ()
+
     @staticmethod
     def get_collecting_info_response(field: str) -> str:
         """Get response for collecting specific information."""
-        responses = {
-            "pharmacy_name": "What's the name of your pharmacy?",
-            "location": "Where is your pharmacy located?",
-            "rx_volume": "How many prescriptions do you typically process each month?",
-            "contact_person": "Who should I speak with about pharmacy management solutions?",
-            "email": "What's the best email address to send you information?",
-        }
-        return responses.get(field, "Could you provide that information?")
+        return _COLLECTING_INFO_RESPONSES.get(
+            field, "Could you provide that information?"
+        )
 
     @staticmethod
     def get_solution_benefits(rx_volume: int) -> str:
         """Get solution benefits based on Rx volume."""
-        if rx_volume >= 1000:
-            return """For high-volume pharmacies like yours, we offer:
-• Advanced automation that can save 20+ hours per week
-• Real-time inventory management with predictive ordering
-• Custom workflow optimization
-• Priority support and dedicated account management
-• Volume-based pricing that scales with your business"""
-        elif rx_volume >= 500:
-            return """For pharmacies of your size, we provide:
-• Streamlined prescription processing
-• Automated inventory tracking
-• Comprehensive reporting and analytics
-• Integration with major pharmacy systems
-• 24/7 technical support"""
-        else:
-            return """We can help you:
-• Automate routine tasks
-• Improve inventory management
-• Enhance patient care coordination
-• Reduce operational costs
-• Scale as your business grows"""
+        return _solution_benefits(rx_volume)
 
     @staticmethod
     def get_follow_up_options() -> str:
         """Get follow-up action options."""
-        return """I'd be happy to help you get started. We can:
+        return _FOLLOW_UP_OPTIONS
+
+    @staticmethod
+    def get_confirmation_message(action: str) -> str:
+        """Get confirmation message for actions."""
+        return _CONFIRMATION_MESSAGES.get(
+            action, "I've processed your request. You'll hear from us soon."
+        )
+
+
+_FOLLOW_UP_OPTIONS = """I'd be happy to help you get started. We can:
 
 1. Send you detailed information via email
 2. Schedule a consultation call to discuss your specific needs
@@ -226,15 +321,33 @@ class ResponseTemplates:
 
 What would work best for you?"""
 
-    @staticmethod
-    def get_confirmation_message(action: str) -> str:
-        """Get confirmation message for actions."""
-        confirmations = {
-            "email_sent": "I've sent you detailed information about our solutions. You should receive it within the next few minutes.",
-            "callback_scheduled": "I've scheduled a consultation call for you. You'll receive a confirmation email with the details.",
-            "demo_scheduled": "I've arranged a demo of our system. Our team will contact you to confirm the details.",
-            "specialist_contact": "I've connected you with one of our pharmacy specialists. They'll reach out within 24 hours.",
-        }
-        return confirmations.get(
-            action, "I've processed your request. You'll hear from us soon."
-        )
+
+# Volume tiers for the solution-benefits pitch. bisect_right over the sorted
+# thresholds maps an rx_volume straight to its tier string, so adding a tier
+# is a one-line change to each tuple rather than a new elif branch.
+_BENEFIT_THRESHOLDS = (500, 1000)
+
+_BENEFIT_TIERS = (
+    """We can help you:
+• Automate routine tasks
+• Improve inventory management
+• Enhance patient care coordination
+• Reduce operational costs
+• Scale as your business grows""",
+    """For pharmacies of your size, we provide:
+• Streamlined prescription processing
+• Automated inventory tracking
+• Comprehensive reporting and analytics
+• Integration with major pharmacy systems
+• 24/7 technical support""",
+    """For high-volume pharmacies like yours, we offer:
+• Advanced automation that can save 20+ hours per week
+• Real-time inventory management with predictive ordering
+• Custom workflow optimization
+• Priority support and dedicated account management
+• Volume-based pricing that scales with your business""",
+)
+
+
+def _solution_benefits(rx_volume: int) -> str:
+    return _BENEFIT_TIERS[bisect_right(_BENEFIT_THRESHOLDS, rx_volume)]
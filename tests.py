@@ -2,13 +2,15 @@
 Tests for the pharmacy chatbot system.
 """
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
+import asyncio
 import json
-import os
-from typing import Dict, Any
-import requests
-from openai import OpenAI
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+from requests.exceptions import ConnectionError, HTTPError, Timeout
 
 from integration import PharmacyAPI, PharmacyData
 from function_calls import FollowUpActions, EmailRequest, CallbackRequest
@@ -16,937 +18,1134 @@ from prompt import PromptTemplates, ConversationState, ResponseTemplates
 from llm import PharmacyChatbot
 
 
-class TestPharmacyAPI(unittest.TestCase):
-    """Test cases for PharmacyAPI class."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.api = PharmacyAPI()
-
-    def test_get_pharmacy_by_phone_existing(self):
-        """Test getting pharmacy by phone number when it exists."""
-        # Mock the session's get method directly
-        with patch.object(self.api.session, "get") as mock_get:
-            # Mock API response
-            mock_response = Mock()
-            mock_response.json.return_value = [
-                {
-                    "id": "1",
-                    "name": "Test Pharmacy",
-                    "phone": "555-123-4567",
-                    "location": "Test City",
-                    "rx_volume": "1500",
-                    "contact_person": "John Doe",
-                    "email": "john@testpharmacy.com",
-                }
-            ]
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-
-            # Test
-            result = self.api.get_pharmacy_by_phone("555-123-4567")
-
-            # Assertions
-            self.assertIsNotNone(result)
-            self.assertEqual(result.name, "Test Pharmacy")
-            self.assertEqual(result.rx_volume, 1500)
-
-    def test_get_pharmacy_by_phone_not_found(self):
-        """Test getting pharmacy by phone number when it doesn't exist."""
-        # Mock the session's get method directly
-        with patch.object(self.api.session, "get") as mock_get:
-            # Mock API response
-            mock_response = Mock()
-            mock_response.json.return_value = []
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-
-            # Test
-            result = self.api.get_pharmacy_by_phone("555-999-9999")
-
-            # Assertions
-            self.assertIsNone(result)
-
-    def test_clean_phone_number(self):
-        """Test phone number cleaning."""
-        self.assertEqual(self.api._clean_phone_number("(555) 123-4567"), "5551234567")
-        self.assertEqual(self.api._clean_phone_number("555.123.4567"), "5551234567")
-        self.assertEqual(self.api._clean_phone_number("5551234567"), "5551234567")
-
-    def test_parse_pharmacy_data(self):
-        """Test parsing pharmacy data."""
-        data = {
-            "id": "1",
-            "name": "Test Pharmacy",
-            "phone": "555-123-4567",
-            "location": "Test City",
-            "rx_volume": "1500",
-            "contact_person": "John Doe",
-            "email": "john@testpharmacy.com",
-            "notes": "Test notes",
-        }
-
-        result = self.api._parse_pharmacy_data(data)
-
-        self.assertEqual(result.name, "Test Pharmacy")
-        self.assertEqual(result.rx_volume, 1500)
-        self.assertEqual(result.email, "john@testpharmacy.com")
-
-    # Edge cases for API integration
-    def test_api_timeout_handling(self):
-        """Test handling of API timeouts."""
-        with patch.object(self.api.session, "get") as mock_get:
-            mock_get.side_effect = requests.Timeout("Request timed out")
-
-            result = self.api.get_pharmacy_by_phone("555-123-4567")
-            self.assertIsNone(result)
-
-    def test_api_connection_error(self):
-        """Test handling of API connection errors."""
-        with patch.object(self.api.session, "get") as mock_get:
-            mock_get.side_effect = requests.ConnectionError("Connection failed")
-
-            result = self.api.get_pharmacy_by_phone("555-123-4567")
-            self.assertIsNone(result)
-
-    def test_api_invalid_response_format(self):
-        """Test handling of invalid API response format."""
-        with patch.object(self.api.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
-
-            result = self.api.get_pharmacy_by_phone("555-123-4567")
-            self.assertIsNone(result)
-
-    def test_api_http_error(self):
-        """Test handling of HTTP errors from API."""
-        with patch.object(self.api.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.raise_for_status.side_effect = requests.HTTPError(
-                "404 Not Found"
+def _ai_response(payload):
+    """Build a mocked chat-completion response exposing .choices[0].message.content.
+
+    Accepts a dict (serialized to JSON) or a raw string. Every level is a
+    SimpleNamespace attribute holder — the tests only read content off the
+    response, so Mock's call tracking and spec machinery are wasted there.
+    """
+    content = payload if isinstance(payload, str) else json.dumps(payload)
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+    )
+
+
+class _FakeCompletions:
+    """Typed stand-in for the OpenAI chat.completions endpoint.
+
+    Tests script the next call by assigning next_content (wrapped in the
+    response shape) or next_exc (raised instead); the chatbot fixture
+    resets both between tests. Unlike a Mock chain, an unexpected
+    attribute access fails loudly here. stream=True calls get the content
+    back in two chunks, with a trailing empty delta as real streams have.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.next_content = "{}"
+        self.next_exc = None
+
+    def create(self, **kwargs):
+        if self.next_exc is not None:
+            raise self.next_exc
+        if kwargs.get("stream"):
+            mid = len(self.next_content) // 2
+            return iter(
+                SimpleNamespace(
+                    choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))]
+                )
+                for piece in (self.next_content[:mid], self.next_content[mid:], None)
             )
-            mock_get.return_value = mock_response
-
-            result = self.api.get_pharmacy_by_phone("555-123-4567")
-            self.assertIsNone(result)
-
-    def test_api_malformed_pharmacy_data(self):
-        """Test handling of malformed pharmacy data from API."""
-        with patch.object(self.api.session, "get") as mock_get:
-            mock_response = Mock()
-            mock_response.json.return_value = [
-                {
-                    "id": "1",
-                    "name": "Test Pharmacy",
-                    # Missing required fields
-                    "phone": None,
-                    "rx_volume": "invalid_number",
-                }
-            ]
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
+        return _ai_response(self.next_content)
+
+
+def _fake_openai_client():
+    """Build a client exposing only the chat.completions.create path."""
+    return SimpleNamespace(chat=SimpleNamespace(completions=_FakeCompletions()))
+
+
+def _sdk_connection_error():
+    """Build an APIConnectionError instance to script the fake client with.
+
+    Constructed via __new__ because the SDK constructor demands a live
+    HTTP request object; the error paths under test only catch and log it.
+    """
+    from openai import APIConnectionError
+
+    return APIConnectionError.__new__(APIConnectionError)
+
+
+# Static payloads serialized once at import instead of per test run.
+_SUCCESS_PAYLOAD = json.dumps(
+    {
+        "pharmacy_name": "Main Street Pharmacy",
+        "location": "New York",
+        "rx_volume": 500,
+        "contact_person": "John Smith",
+        "email": "john@pharmacy.com",
+    }
+)
+
+_PARTIAL_PAYLOAD = json.dumps(
+    {
+        "pharmacy_name": "Downtown Pharmacy",
+        "location": "Chicago",
+        "rx_volume": 800,
+        "contact_person": None,
+        "email": None,
+    }
+)
+
+# Fully collected lead info, as _extract_pharmacy_info would return it.
+_COMPLETE_INFO = {
+    "pharmacy_name": "Test Pharmacy",
+    "location": "Test City",
+    "rx_volume": 1500,
+    "contact_person": "John Doe",
+    "email": "john@testpharmacy.com",
+}
+
+# Canonical pharmacy record reused across tests; PharmacyData is frozen, so
+# sharing one instance is safe.
+_TEST_PHARMACY = PharmacyData(
+    id="1",
+    name="Test Pharmacy",
+    phone="555-123-4567",
+    location="Test City",
+    rx_volume=1500,
+    contact_person="John Doe",
+    email="john@testpharmacy.com",
+)
+
+
+def _reset_chatbot(chatbot):
+    """Return a shared chatbot fixture to a pristine state.
+
+    Covers the attributes reset_conversation leaves alone so tests that
+    flip AI availability or fill the per-instance caches don't leak into
+    each other.
+    """
+    chatbot.reset_conversation()
+    chatbot.ai_available = True
+    chatbot.ai_extraction_failures = 0
+    chatbot._extract_cache.clear()
+    chatbot._response_cache.clear()
+    chatbot._summary_cache = None
+    chatbot.client.chat.completions.reset()
+    # The chatbot shares the process-wide PharmacyAPI; clear its lookup
+    # caches so unmocked lookups in one test don't shadow the next.
+    chatbot.pharmacy_api._negative_cache.clear()
+    chatbot.pharmacy_api._phone_index = None
+
+
+@pytest.fixture(scope="module")
+def _shared_api():
+    """One PharmacyAPI for the whole module; every test mocks session.get."""
+    return PharmacyAPI()
+
+
+@pytest.fixture
+def api(_shared_api):
+    """Shared API client with lookup caches cleared per test."""
+    _shared_api._negative_cache.clear()
+    _shared_api._phone_index = None
+    return _shared_api
+
+
+@pytest.fixture
+def actions():
+    """Fresh follow-up action handler."""
+    return FollowUpActions()
+
+
+@pytest.fixture(scope="module")
+def _shared_chatbot():
+    """One chatbot per module with an injected fake OpenAI client."""
+    return PharmacyChatbot(openai_client=_fake_openai_client())
+
+
+@pytest.fixture
+def chatbot(_shared_chatbot):
+    """Shared chatbot reset to a pristine state for each test."""
+    _reset_chatbot(_shared_chatbot)
+    return _shared_chatbot
+
+
+# ---------------------------------------------------------------------------
+# PharmacyAPI
+# ---------------------------------------------------------------------------
+
+
+def test_get_pharmacy_by_phone_existing(api):
+    """Test getting pharmacy by phone number when it exists."""
+    # Mock the session's get method directly
+    with patch.object(api.session, "get") as mock_get:
+        # Mock API response
+        payload = [
+            {
+                "id": "1",
+                "name": "Test Pharmacy",
+                "phone": "555-123-4567",
+                "location": "Test City",
+                "rx_volume": "1500",
+                "contact_person": "John Doe",
+                "email": "john@testpharmacy.com",
+            }
+        ]
+        mock_response = Mock()
+        mock_response.json.return_value = payload
+        mock_response.content = json.dumps(payload).encode()
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
 
-            result = self.api.get_pharmacy_by_phone("555-123-4567")
-            # Should handle gracefully and return None or valid data
-            self.assertIsNone(result)
+        result = api.get_pharmacy_by_phone("555-123-4567")
 
+        assert result is not None
+        assert result.name == "Test Pharmacy"
+        assert result.rx_volume == 1500
 
-class TestFollowUpActions(unittest.TestCase):
-    """Test cases for FollowUpActions class."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.actions = FollowUpActions()
+def test_get_pharmacy_by_phone_not_found(api):
+    """Test getting pharmacy by phone number when it doesn't exist."""
+    with patch.object(api.session, "get") as mock_get:
+        mock_response = Mock()
+        mock_response.json.return_value = []
+        mock_response.content = b"[]"
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        result = api.get_pharmacy_by_phone("555-999-9999")
+
+        assert result is None
+
+
+@pytest.mark.parametrize(
+    "raw,clean",
+    [
+        ("(555) 123-4567", "5551234567"),
+        ("555.123.4567", "5551234567"),
+        ("5551234567", "5551234567"),
+        # En dashes, as pasted from formatted documents
+        ("555–123–4567", "5551234567"),
+    ],
+)
+def test_clean_phone_number(api, raw, clean):
+    """Phone numbers are stripped to digits regardless of formatting."""
+    assert api._clean_phone_number(raw) == clean
+
+
+def test_get_pharmacies_by_phones(api):
+    """Batch lookups resolve concurrently and keep input order."""
+    with patch.object(api.session, "get") as mock_get:
+        payload = [
+            {
+                "id": "1",
+                "name": "Test Pharmacy",
+                "phone": "555-123-4567",
+                "location": "Test City",
+                "rx_volume": 1500,
+                "contact_person": "John Doe",
+                "email": "john@testpharmacy.com",
+            }
+        ]
+        mock_response = Mock()
+        mock_response.json.return_value = payload
+        mock_response.content = json.dumps(payload).encode()
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
 
-    def test_send_email(self):
-        """Test sending email."""
-        email_request = EmailRequest(
-            to_email="test@example.com",
-            subject="Test Subject",
-            body="Test Body",
-            pharmacy_name="Test Pharmacy",
-            contact_person="John Doe",
+        results = asyncio.run(
+            api.get_pharmacies_by_phones(["555-123-4567", "555-999-9999"])
         )
 
-        result = self.actions.send_email(email_request)
+    assert results[0].name == "Test Pharmacy"
+    assert results[1] is None
+
+
+def test_parse_pharmacy_data(api):
+    """Test parsing pharmacy data."""
+    data = {
+        "id": "1",
+        "name": "Test Pharmacy",
+        "phone": "555-123-4567",
+        "location": "Test City",
+        "rx_volume": "1500",
+        "contact_person": "John Doe",
+        "email": "john@testpharmacy.com",
+        "notes": "Test notes",
+    }
+
+    result = api._parse_pharmacy_data(data)
+
+    assert result.name == "Test Pharmacy"
+    assert result.rx_volume == 1500
+    assert result.email == "john@testpharmacy.com"
+
+
+# Edge cases for API integration
+@pytest.mark.parametrize(
+    "exc",
+    [
+        Timeout("Request timed out"),
+        ConnectionError("Connection failed"),
+    ],
+    ids=["timeout", "connection_error"],
+)
+def test_api_request_errors(api, exc):
+    """Request-level failures are handled and reported as a miss."""
+    with patch.object(api.session, "get") as mock_get:
+        mock_get.side_effect = exc
+
+        assert api.get_pharmacy_by_phone("555-123-4567") is None
+
+
+def test_api_invalid_response_format(api):
+    """Test handling of invalid API response format."""
+    with patch.object(api.session, "get") as mock_get:
+        mock_response = Mock()
+        mock_response.json.side_effect = json.JSONDecodeError("Invalid JSON", "", 0)
+        mock_response.content = b"not valid json"
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
 
-        self.assertTrue(result["success"])
-        self.assertIn("email_id", result)
-        self.assertEqual(len(self.actions.sent_emails), 1)
+        assert api.get_pharmacy_by_phone("555-123-4567") is None
 
-    def test_schedule_callback(self):
-        """Test scheduling callback."""
-        callback_request = CallbackRequest(
-            phone_number="555-123-4567",
-            preferred_time="tomorrow at 2 PM",
-            pharmacy_name="Test Pharmacy",
-            contact_person="John Doe",
-        )
 
-        result = self.actions.schedule_callback(callback_request)
-
-        self.assertTrue(result["success"])
-        self.assertIn("callback_id", result)
-        self.assertEqual(len(self.actions.scheduled_callbacks), 1)
-
-    def test_send_welcome_email(self):
-        """Test sending welcome email."""
-        pharmacy = PharmacyData(
-            id="1",
-            name="Test Pharmacy",
-            phone="555-123-4567",
-            location="Test City",
-            rx_volume=1500,
-            contact_person="John Doe",
-            email="john@testpharmacy.com",
-        )
+def test_api_http_error(api):
+    """Test handling of HTTP errors from API."""
+    with patch.object(api.session, "get") as mock_get:
+        mock_response = Mock()
+        mock_response.raise_for_status.side_effect = HTTPError("404 Not Found")
+        mock_get.return_value = mock_response
 
-        result = self.actions.send_welcome_email(pharmacy)
-
-        self.assertTrue(result["success"])
-        # Check that the email was sent successfully (the message format may vary)
-        self.assertIn("Test Pharmacy", result["message"])
-
-    def test_send_high_volume_offer(self):
-        """Test sending high volume offer."""
-        pharmacy = PharmacyData(
-            id="1",
-            name="Test Pharmacy",
-            phone="555-123-4567",
-            location="Test City",
-            rx_volume=1500,
-            contact_person="John Doe",
-            email="john@testpharmacy.com",
-        )
+        assert api.get_pharmacy_by_phone("555-123-4567") is None
 
-        result = self.actions.send_high_volume_offer(pharmacy)
 
-        self.assertTrue(result["success"])
-        # Check that the email was sent successfully (the message format may vary)
-        self.assertIn("Test Pharmacy", result["message"])
+def test_api_malformed_pharmacy_data(api):
+    """Test handling of malformed pharmacy data from API."""
+    with patch.object(api.session, "get") as mock_get:
+        payload = [
+            {
+                "id": "1",
+                "name": "Test Pharmacy",
+                # Missing required fields
+                "phone": None,
+                "rx_volume": "invalid_number",
+            }
+        ]
+        mock_response = Mock()
+        mock_response.json.return_value = payload
+        mock_response.content = json.dumps(payload).encode()
+        mock_response.raise_for_status.return_value = None
+        mock_get.return_value = mock_response
+
+        # Should handle gracefully and return None or valid data
+        assert api.get_pharmacy_by_phone("555-123-4567") is None
+
+
+# ---------------------------------------------------------------------------
+# FollowUpActions
+# ---------------------------------------------------------------------------
+
+
+def test_send_email(actions, fixed_timestamp):
+    """Test sending email."""
+    email_request = EmailRequest(
+        to_email="test@example.com",
+        subject="Test Subject",
+        body="Test Body",
+        pharmacy_name="Test Pharmacy",
+        contact_person="John Doe",
+    )
+
+    result = actions.send_email(email_request)
+
+    assert result["success"]
+    assert result["email_id"] == 1
+    assert result["sent_at"] == fixed_timestamp
+    assert len(actions.sent_emails) == 1
+
+
+def test_schedule_callback(actions, fixed_timestamp):
+    """Test scheduling callback."""
+    callback_request = CallbackRequest(
+        phone_number="555-123-4567",
+        preferred_time="tomorrow at 2 PM",
+        pharmacy_name="Test Pharmacy",
+        contact_person="John Doe",
+    )
+
+    result = actions.schedule_callback(callback_request)
+
+    assert result["success"]
+    assert result["callback_id"] == 1
+    assert result["scheduled_at"] == fixed_timestamp
+    assert len(actions.scheduled_callbacks) == 1
+
+
+def test_send_email_async(actions):
+    """Async email sends record the same result as the sync path."""
+    email_request = EmailRequest(
+        to_email="test@example.com",
+        subject="Test Subject",
+        body="Test Body",
+        pharmacy_name="Test Pharmacy",
+        contact_person="John Doe",
+    )
 
+    result = asyncio.run(actions.send_email_async(email_request))
 
-class TestPromptTemplates(unittest.TestCase):
-    """Test cases for PromptTemplates class."""
+    assert result["success"]
+    assert result["email_id"] == 1
+    assert actions.email_count() == 1
 
-    def test_format_greeting_existing_customer(self):
-        """Test formatting greeting for existing customer."""
-        pharmacy_data = {
-            "name": "Test Pharmacy",
-            "location": "Test City",
-            "rx_volume": 1500,
-        }
 
-        result = PromptTemplates.format_greeting(pharmacy_data)
+def test_schedule_callback_async(actions):
+    """Async callback scheduling records the same result as the sync path."""
+    callback_request = CallbackRequest(
+        phone_number="555-123-4567",
+        preferred_time="tomorrow at 2 PM",
+        pharmacy_name="Test Pharmacy",
+        contact_person="John Doe",
+    )
 
-        self.assertIn("Test Pharmacy", result)
-        self.assertIn("Test City", result)
-        self.assertIn("1500", result)
+    result = asyncio.run(actions.schedule_callback_async(callback_request))
 
-    def test_format_greeting_new_lead(self):
-        """Test formatting greeting for new lead."""
-        result = PromptTemplates.format_greeting()
+    assert result["success"]
+    assert result["callback_id"] == 1
+    assert actions.callback_count() == 1
 
-        self.assertIn("Pharmesol", result)
-        self.assertIn("pharmacy management solutions", result)
 
-    def test_format_high_volume_message(self):
-        """Test formatting high volume message."""
-        result = PromptTemplates.format_high_volume_message(1500)
+def test_send_batch(actions):
+    """Batched sends return email results first, then callbacks, in order."""
+    email_request = EmailRequest(
+        to_email="test@example.com",
+        subject="Test Subject",
+        body="Test Body",
+        pharmacy_name="Test Pharmacy",
+        contact_person="John Doe",
+    )
+    callback_request = CallbackRequest(
+        phone_number="555-123-4567",
+        preferred_time="tomorrow at 2 PM",
+        pharmacy_name="Test Pharmacy",
+        contact_person="John Doe",
+    )
 
-        self.assertIn("1500", result)
-        self.assertIn("high-volume pharmacy", result)
+    results = asyncio.run(actions.send_batch([email_request], [callback_request]))
 
-    def test_format_email_offer(self):
-        """Test formatting email offer."""
-        result = PromptTemplates.format_email_offer("Test Pharmacy", "test@example.com")
+    assert len(results) == 2
+    assert results[0]["success"] and "email_id" in results[0]
+    assert results[1]["success"] and "callback_id" in results[1]
+    assert actions.email_count() == 1
+    assert actions.callback_count() == 1
 
-        self.assertIn("Test Pharmacy", result)
-        self.assertIn("test@example.com", result)
 
+def test_send_many(actions):
+    """The bulk follow-up pass fires all three actions per pharmacy."""
+    results = actions.send_many([_TEST_PHARMACY, _TEST_PHARMACY])
 
-class TestResponseTemplates(unittest.TestCase):
-    """Test cases for ResponseTemplates class."""
+    assert len(results) == 2
+    for result in results:
+        assert result["pharmacy_name"] == "Test Pharmacy"
+        assert result["welcome_email"]["success"]
+        assert result["high_volume_offer"]["success"]
+        assert result["consultation"]["success"]
+    assert actions.email_count() == 4
+    assert actions.callback_count() == 2
 
-    def test_get_collecting_info_response(self):
-        """Test getting collecting info response."""
-        result = ResponseTemplates.get_collecting_info_response("pharmacy_name")
 
-        self.assertIn("name", result.lower())
+def test_dump_history_json(actions):
+    """JSON dumps round-trip to the same records the history getters return."""
+    actions.send_welcome_email(_TEST_PHARMACY)
+    actions.schedule_consultation(_TEST_PHARMACY)
 
-    def test_get_solution_benefits_high_volume(self):
-        """Test getting solution benefits for high volume."""
-        result = ResponseTemplates.get_solution_benefits(1500)
+    assert json.loads(actions.dump_email_history_json()) == actions.get_email_history()
+    assert (
+        json.loads(actions.dump_callback_history_json())
+        == actions.get_callback_history()
+    )
 
-        self.assertIn("high-volume", result)
-        self.assertIn("automation", result)
 
-    def test_get_solution_benefits_medium_volume(self):
-        """Test getting solution benefits for medium volume."""
-        result = ResponseTemplates.get_solution_benefits(750)
+def test_count_emails_by_pharmacy(actions):
+    """Per-pharmacy counts only see that pharmacy's emails."""
+    actions.send_welcome_email(_TEST_PHARMACY)
+    actions.send_high_volume_offer(_TEST_PHARMACY)
 
-        self.assertIn("Streamlined prescription processing", result)
-        self.assertIn("analytics", result)
+    assert actions.count_emails_by_pharmacy("Test Pharmacy") == 2
+    assert actions.count_emails_by_pharmacy("Other Pharmacy") == 0
 
-    def test_get_solution_benefits_low_volume(self):
-        """Test getting solution benefits for low volume."""
-        result = ResponseTemplates.get_solution_benefits(200)
 
-        self.assertIn("Automate routine tasks", result)
-        self.assertIn("inventory", result)
+def test_send_welcome_email(actions):
+    """Test sending welcome email."""
+    result = actions.send_welcome_email(_TEST_PHARMACY)
 
+    assert result["success"]
+    # Check that the email was sent successfully (the message format may vary)
+    assert "Test Pharmacy" in result["message"]
 
-class TestLLMIntegration(unittest.TestCase):
-    """Test cases for LLM integration and AI model responses."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            with patch("llm.OpenAI") as mock_openai:
-                # Mock the OpenAI client
-                mock_client = Mock()
-                mock_openai.return_value = mock_client
-                self.chatbot = PharmacyChatbot()
+def test_send_high_volume_offer(actions):
+    """Test sending high volume offer."""
+    result = actions.send_high_volume_offer(_TEST_PHARMACY)
 
-    def test_ai_extract_pharmacy_info_success(self):
-        """Test successful AI extraction of pharmacy information."""
-        # Mock AI response
-        mock_response = Mock()
-        mock_choice = Mock()
-        mock_message = Mock()
-        mock_message.content = json.dumps(
-            {
-                "pharmacy_name": "Main Street Pharmacy",
-                "location": "New York",
-                "rx_volume": 500,
-                "contact_person": "John Smith",
-                "email": "john@pharmacy.com",
-            }
-        )
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+    assert result["success"]
+    # Check that the email was sent successfully (the message format may vary)
+    assert "Test Pharmacy" in result["message"]
 
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.return_value = mock_response
 
-            result = self.chatbot._extract_pharmacy_info(
-                "My pharmacy is Main Street Pharmacy in New York"
-            )
+# ---------------------------------------------------------------------------
+# PromptTemplates / ResponseTemplates
+# ---------------------------------------------------------------------------
 
-            self.assertEqual(result["pharmacy_name"], "Main Street Pharmacy")
-            self.assertEqual(result["location"], "New York")
-            self.assertEqual(result["rx_volume"], 500)
-            self.assertEqual(result["contact_person"], "John Smith")
-            self.assertEqual(result["email"], "john@pharmacy.com")
 
-    def test_ai_extract_pharmacy_info_partial(self):
-        """Test AI extraction with partial information."""
-        # Mock AI response with partial data
-        mock_response = Mock()
-        mock_choice = Mock()
-        mock_message = Mock()
-        mock_message.content = json.dumps(
-            {
-                "pharmacy_name": "Downtown Pharmacy",
-                "location": "Chicago",
-                "rx_volume": 800,
-                "contact_person": None,
-                "email": None,
-            }
-        )
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+def test_format_greeting_existing_customer():
+    """Test formatting greeting for existing customer."""
+    pharmacy_data = {
+        "name": "Test Pharmacy",
+        "location": "Test City",
+        "rx_volume": 1500,
+    }
 
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.return_value = mock_response
+    result = PromptTemplates.format_greeting(pharmacy_data)
 
-            result = self.chatbot._extract_pharmacy_info(
-                "I work at Downtown Pharmacy in Chicago"
-            )
+    assert "Test Pharmacy" in result
+    assert "Test City" in result
+    assert "1500" in result
 
-            self.assertEqual(result["pharmacy_name"], "Downtown Pharmacy")
-            self.assertEqual(result["location"], "Chicago")
-            self.assertEqual(result["rx_volume"], 800)
-            self.assertNotIn("contact_person", result)
-            self.assertNotIn("email", result)
 
-    def test_ai_extract_pharmacy_info_invalid_json(self):
-        """Test AI extraction with invalid JSON response."""
-        # Mock AI response with invalid JSON
-        mock_response = Mock()
-        mock_choice = Mock()
-        mock_message = Mock()
-        mock_message.content = "Invalid JSON response"
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+def test_format_greeting_new_lead():
+    """Test formatting greeting for new lead."""
+    result = PromptTemplates.format_greeting()
 
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.return_value = mock_response
+    assert "Pharmesol" in result
+    assert "pharmacy management solutions" in result
 
-            result = self.chatbot._extract_pharmacy_info("My pharmacy is Test Pharmacy")
 
-            self.assertEqual(result, {})
+def test_format_high_volume_message():
+    """Test formatting high volume message."""
+    result = PromptTemplates.format_high_volume_message(1500)
 
-    def test_ai_extract_pharmacy_info_api_error(self):
-        """Test AI extraction when API call fails."""
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.side_effect = Exception("API Error")
+    assert "1500" in result
+    assert "high-volume pharmacy" in result
 
-            result = self.chatbot._extract_pharmacy_info("My pharmacy is Test Pharmacy")
 
-            self.assertEqual(result, {})
+def test_format_email_offer():
+    """Test formatting email offer."""
+    result = PromptTemplates.format_email_offer("Test Pharmacy", "test@example.com")
 
-    def test_ai_generate_response_success(self):
-        """Test successful AI response generation."""
-        # Mock AI response
-        mock_response = Mock()
-        mock_choice = Mock()
-        mock_message = Mock()
-        mock_message.content = (
-            "I'd be happy to help you with your pharmacy management needs."
-        )
-        mock_choice.message = mock_message
-        mock_response.choices = [mock_choice]
+    assert "Test Pharmacy" in result
+    assert "test@example.com" in result
 
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.return_value = mock_response
 
-            result = self.chatbot._generate_ai_response(
-                "I need help with inventory management"
-            )
+def test_get_collecting_info_response():
+    """Test getting collecting info response."""
+    result = ResponseTemplates.get_collecting_info_response("pharmacy_name")
 
-            self.assertEqual(
-                result, "I'd be happy to help you with your pharmacy management needs."
-            )
+    assert "name" in result.lower()
 
-    def test_ai_generate_response_api_error(self):
-        """Test AI response generation when API call fails."""
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.side_effect = Exception("API Error")
 
-            result = self.chatbot._generate_ai_response(
-                "I need help with inventory management"
-            )
+@pytest.mark.parametrize(
+    "rx_volume,expected_snippets",
+    [
+        (1500, ("high-volume", "automation")),
+        (750, ("Streamlined prescription processing", "analytics")),
+        (200, ("Automate routine tasks", "inventory")),
+    ],
+)
+def test_get_solution_benefits(rx_volume, expected_snippets):
+    """Each volume bucket pitches its own benefit tier."""
+    result = ResponseTemplates.get_solution_benefits(rx_volume)
+    for snippet in expected_snippets:
+        assert snippet in result
 
-            self.assertIn("having trouble generating a response", result)
 
-    def test_ai_generate_response_rate_limit(self):
-        """Test AI response generation with rate limiting."""
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.side_effect = Exception("Rate limit exceeded")
+# ---------------------------------------------------------------------------
+# LLM integration
+# ---------------------------------------------------------------------------
 
-            result = self.chatbot._generate_ai_response(
-                "I need help with inventory management"
-            )
 
-            self.assertIn("having trouble generating a response", result)
+def test_ai_extract_pharmacy_info_success(chatbot):
+    """Test successful AI extraction of pharmacy information."""
+    chatbot.client.chat.completions.next_content = _SUCCESS_PAYLOAD
 
-    def test_ai_generate_response_model_unavailable(self):
-        """Test AI response generation when model is unavailable."""
-        with patch.object(
-            self.chatbot.client.chat.completions, "create"
-        ) as mock_create:
-            mock_create.side_effect = Exception("Model not found")
+    result = chatbot._extract_pharmacy_info(
+        "My pharmacy is Main Street Pharmacy in New York"
+    )
 
-            result = self.chatbot._generate_ai_response(
-                "I need help with inventory management"
-            )
+    assert result["pharmacy_name"] == "Main Street Pharmacy"
+    assert result["location"] == "New York"
+    assert result["rx_volume"] == 500
+    assert result["contact_person"] == "John Smith"
+    assert result["email"] == "john@pharmacy.com"
 
-            self.assertIn("having trouble generating a response", result)
-
-    def test_ai_extract_pharmacy_info_edge_cases(self):
-        """Test AI extraction with various edge cases."""
-        test_cases = [
-            # Empty message
-            ("", {}),
-            # Very long message
-            ("A" * 1000, {}),
-            # Message with special characters
-            ("My pharmacy is Test-Pharmacy & Co. in New York!", {}),
-            # Message with numbers in different formats
-            ("We process 1,500 prescriptions monthly", {}),
-            # Message with multiple email addresses
-            ("Contact me at john@pharmacy.com or backup@pharmacy.com", {}),
-        ]
 
-        for message, expected in test_cases:
-            with patch.object(
-                self.chatbot.client.chat.completions, "create"
-            ) as mock_create:
-                mock_response = Mock()
-                mock_choice = Mock()
-                mock_message = Mock()
-                mock_message.content = "{}"
-                mock_choice.message = mock_message
-                mock_response.choices = [mock_choice]
-                mock_create.return_value = mock_response
-
-                result = self.chatbot._extract_pharmacy_info(message)
-                # Should handle gracefully without crashing
-                self.assertIsInstance(result, dict)
-
-
-class TestPharmacyChatbot(unittest.TestCase):
-    """Test cases for PharmacyChatbot class."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            with patch("llm.OpenAI") as mock_openai:
-                # Mock the OpenAI client
-                mock_client = Mock()
-                mock_openai.return_value = mock_client
-                self.chatbot = PharmacyChatbot()
-
-    def test_start_call_existing_customer(self):
-        """Test starting call with existing customer."""
-        # Mock pharmacy data
-        mock_pharmacy = PharmacyData(
-            id="1",
-            name="Test Pharmacy",
-            phone="555-123-4567",
-            location="Test City",
-            rx_volume=1500,
-            contact_person="John Doe",
-            email="john@testpharmacy.com",
-        )
+def test_ai_extract_pharmacy_info_partial(chatbot):
+    """Test AI extraction with partial information."""
+    chatbot.client.chat.completions.next_content = _PARTIAL_PAYLOAD
 
-        # Mock the pharmacy API instance
-        with patch.object(
-            self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-        ) as mock_get_pharmacy:
-            mock_get_pharmacy.return_value = mock_pharmacy
+    result = chatbot._extract_pharmacy_info("I work at Downtown Pharmacy in Chicago")
 
-            # Test
-            result = self.chatbot.start_call("555-123-4567")
+    assert result["pharmacy_name"] == "Downtown Pharmacy"
+    assert result["location"] == "Chicago"
+    assert result["rx_volume"] == 800
+    assert "contact_person" not in result
+    assert "email" not in result
 
-            # Assertions
-            self.assertIn("Test Pharmacy", result)
-            self.assertEqual(
-                self.chatbot.current_state, ConversationState.DISCUSSING_SOLUTIONS
-            )
 
-    def test_start_call_new_lead(self):
-        """Test starting call with new lead."""
-        # Mock no pharmacy found
-        with patch.object(
-            self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-        ) as mock_get_pharmacy:
-            mock_get_pharmacy.return_value = None
-
-            # Test
-            result = self.chatbot.start_call("555-999-9999")
-
-            # Assertions
-            self.assertIn("Pharmesol", result)
-            self.assertEqual(
-                self.chatbot.current_state, ConversationState.COLLECTING_INFO
-            )
+def test_ai_extract_pharmacy_info_invalid_json(chatbot):
+    """Test AI extraction with invalid JSON response."""
+    chatbot.client.chat.completions.next_content = "Invalid JSON response"
+
+    result = chatbot._extract_pharmacy_info("My pharmacy is Test Pharmacy")
+
+    assert result == {}
+
+
+def test_ai_extract_pharmacy_info_api_error(chatbot):
+    """Test AI extraction when API call fails."""
+    chatbot.client.chat.completions.next_exc = Exception("API Error")
+
+    result = chatbot._extract_pharmacy_info("My pharmacy is Test Pharmacy")
+
+    assert result == {}
+
+
+def test_ai_generate_response_success(chatbot):
+    """Test successful AI response generation."""
+    chatbot.client.chat.completions.next_content = (
+        "I'd be happy to help you with your pharmacy management needs."
+    )
+
+    result = chatbot._generate_ai_response("I need help with inventory management")
+
+    assert result == "I'd be happy to help you with your pharmacy management needs."
+
+
+@pytest.mark.parametrize(
+    "error_message",
+    ["API Error", "Rate limit exceeded", "Model not found"],
+    ids=["api_error", "rate_limit", "model_unavailable"],
+)
+def test_ai_generate_response_errors(chatbot, error_message):
+    """Any completion failure degrades to the retry message."""
+    chatbot.client.chat.completions.next_exc = Exception(error_message)
+
+    result = chatbot._generate_ai_response("I need help with inventory management")
+
+    assert "having trouble generating a response" in result
+
+
+def test_stream_ai_response_success(chatbot):
+    """Streaming yields fragments that join into the full completion."""
+    chatbot.client.chat.completions.next_content = (
+        "Happy to walk you through our solutions."
+    )
+
+    fragments = list(chatbot.stream_ai_response("Tell me more"))
+
+    assert len(fragments) == 2
+    assert "".join(fragments) == "Happy to walk you through our solutions."
+
+
+def test_stream_ai_response_generic_error(chatbot):
+    """A failed stream degrades to the retry message without disabling AI."""
+    chatbot.client.chat.completions.next_exc = Exception("API Error")
+
+    fragments = list(chatbot.stream_ai_response("Tell me more"))
+
+    assert len(fragments) == 1
+    assert "having trouble generating a response" in fragments[0]
+    assert chatbot.ai_available
+
 
-    @patch("llm.PharmacyChatbot._extract_pharmacy_info")
-    def test_handle_info_collection(self, mock_extract):
-        """Test handling information collection."""
-        # Mock extracted info
-        mock_extract.return_value = {
-            "pharmacy_name": "Test Pharmacy",
-            "location": "Test City",
-            "rx_volume": 1500,
-            "contact_person": "John Doe",
-            "email": "john@testpharmacy.com",
-        }
+def test_stream_ai_response_connection_error(chatbot):
+    """An SDK connection failure mid-stream flips AI off."""
+    chatbot.client.chat.completions.next_exc = _sdk_connection_error()
+
+    fragments = list(chatbot.stream_ai_response("Tell me more"))
+
+    assert len(fragments) == 1
+    assert "fallback mode" in fragments[0]
+    assert not chatbot.ai_available
+
+
+def test_stream_ai_response_fallback_mode(chatbot):
+    """With AI already off, streaming yields only the fallback message."""
+    chatbot.ai_available = False
+
+    fragments = list(chatbot.stream_ai_response("Tell me more"))
+
+    assert len(fragments) == 1
+    assert "fallback mode" in fragments[0]
+
+
+def test_prefetch_extraction_warms_cache(chatbot):
+    """Background extraction lands in the cache for the later real call."""
+    chatbot.client.chat.completions.next_content = _SUCCESS_PAYLOAD
+    message = "My pharmacy is Main Street Pharmacy in New York"
+
+    async def run():
+        await chatbot.prefetch_extraction(message)
+
+    asyncio.run(run())
+
+    assert message.strip().lower() in chatbot._extract_cache
+    assert chatbot._extract_pharmacy_info(message)["pharmacy_name"] == (
+        "Main Street Pharmacy"
+    )
+
+
+def test_prefetch_likely_responses_warms_cache(chatbot):
+    """Speculative warmup caches responses keyed on the scheduling state."""
+    chatbot.client.chat.completions.next_content = "Happy to help."
+
+    async def run():
+        await chatbot.prefetch_likely_responses(limit=1)
+
+    asyncio.run(run())
+
+    assert len(chatbot._response_cache) == 1
+    ((state, _),) = chatbot._response_cache.keys()
+    assert state == chatbot.current_state
+
+
+def test_prefetch_likely_responses_skips_on_state_change(chatbot):
+    """Warmup scheduled for one state stops if the conversation moves on."""
+    chatbot.client.chat.completions.next_content = "Happy to help."
+
+    async def run():
+        task = chatbot.prefetch_likely_responses(limit=2)
+        chatbot.current_state = ConversationState.CLOSING
+        await task
+
+    asyncio.run(run())
+
+    assert not chatbot._response_cache
+
+
+@pytest.mark.parametrize(
+    "message",
+    [
+        # Empty message
+        "",
+        # Very long message
+        "A" * 1000,
+        # Message with special characters
+        "My pharmacy is Test-Pharmacy & Co. in New York!",
+        # Message with numbers in different formats
+        "We process 1,500 prescriptions monthly",
+        # Message with multiple email addresses
+        "Contact me at john@pharmacy.com or backup@pharmacy.com",
+    ],
+)
+def test_ai_extract_pharmacy_info_edge_cases(chatbot, message):
+    """Test AI extraction with various edge cases."""
+    result = chatbot._extract_pharmacy_info(message)
+    # Should handle gracefully without crashing
+    assert isinstance(result, dict)
+
+
+# ---------------------------------------------------------------------------
+# PharmacyChatbot
+# ---------------------------------------------------------------------------
+
+
+def test_start_call_existing_customer(chatbot):
+    """Test starting call with existing customer."""
+    # Mock the pharmacy API instance
+    with patch.object(chatbot.pharmacy_api, "get_pharmacy_by_phone") as mock_get:
+        mock_get.return_value = _TEST_PHARMACY
+
+        result = chatbot.start_call("555-123-4567")
+
+        assert "Test Pharmacy" in result
+        assert chatbot.current_state == ConversationState.DISCUSSING_SOLUTIONS
+
+
+def test_start_call_new_lead(chatbot):
+    """Test starting call with new lead."""
+    # Mock no pharmacy found
+    with patch.object(chatbot.pharmacy_api, "get_pharmacy_by_phone") as mock_get:
+        mock_get.return_value = None
+
+        result = chatbot.start_call("555-999-9999")
+
+        assert "Pharmesol" in result
+        assert chatbot.current_state == ConversationState.COLLECTING_INFO
+
+
+def test_async_chat_entry_points(chatbot):
+    """The async wrappers behave like their sync counterparts."""
+    with patch.object(chatbot.pharmacy_api, "get_pharmacy_by_phone") as mock_get:
+        mock_get.return_value = None
+
+        async def run():
+            greeting = await chatbot.start_call_async("555-999-9999")
+            reply = await chatbot.process_message_async("My pharmacy is Test Pharmacy")
+            return greeting, reply
+
+        greeting, reply = asyncio.run(run())
+
+    assert "Pharmesol" in greeting
+    assert isinstance(reply, str)
+    assert chatbot.current_state == ConversationState.COLLECTING_INFO
+
+
+def test_handle_info_collection(chatbot):
+    """Test handling information collection."""
+    with patch.object(chatbot, "_extract_pharmacy_info") as mock_extract:
+        mock_extract.return_value = dict(_COMPLETE_INFO)
 
         # Set state to collecting info
-        self.chatbot.current_state = ConversationState.COLLECTING_INFO
+        chatbot.current_state = ConversationState.COLLECTING_INFO
 
-        # Test
-        result = self.chatbot.process_message(
-            "My pharmacy is Test Pharmacy in Test City"
-        )
+        result = chatbot.process_message("My pharmacy is Test Pharmacy in Test City")
 
-        # Assertions
-        self.assertIn("high-volume", result)
-        self.assertEqual(
-            self.chatbot.current_state, ConversationState.DISCUSSING_SOLUTIONS
-        )
+        assert "high-volume" in result
+        assert chatbot.current_state == ConversationState.DISCUSSING_SOLUTIONS
 
-    def test_handle_solution_discussion(self):
-        """Test handling solution discussion."""
-        # Set up pharmacy data and state
-        self.chatbot.pharmacy_data = PharmacyData(
-            id="1",
-            name="Test Pharmacy",
-            phone="555-123-4567",
-            location="Test City",
-            rx_volume=1500,
-            contact_person="John Doe",
-            email="john@testpharmacy.com",
-        )
-        self.chatbot.current_state = ConversationState.DISCUSSING_SOLUTIONS
 
-        # Test
-        result = self.chatbot.process_message("Yes, I would like more information")
+def test_handle_solution_discussion(chatbot):
+    """Test handling solution discussion."""
+    # Set up pharmacy data and state
+    chatbot.pharmacy_data = _TEST_PHARMACY
+    chatbot.current_state = ConversationState.DISCUSSING_SOLUTIONS
 
-        # Assertions
-        self.assertIn("email", result.lower())
-        self.assertEqual(
-            self.chatbot.current_state, ConversationState.OFFERING_FOLLOW_UP
-        )
+    result = chatbot.process_message("Yes, I would like more information")
 
-    def test_get_conversation_summary(self):
-        """Test getting conversation summary."""
-        # Set up some conversation data
-        self.chatbot.pharmacy_data = PharmacyData(
-            id="1",
-            name="Test Pharmacy",
-            phone="555-123-4567",
-            location="Test City",
-            rx_volume=1500,
-            contact_person="John Doe",
-            email="john@testpharmacy.com",
-        )
-        self.chatbot.conversation_history = [{"role": "user", "content": "test"}]
-
-        # Test
-        summary = self.chatbot.get_conversation_summary()
-
-        # Assertions
-        self.assertIn("state", summary)
-        self.assertIn("pharmacy_data", summary)
-        self.assertIn("collected_info", summary)
-        self.assertIn("conversation_length", summary)
-        self.assertIn("follow_up_actions", summary)
-
-    def test_reset_conversation(self):
-        """Test resetting conversation."""
-        # Set up some conversation data
-        self.chatbot.pharmacy_data = PharmacyData(
-            id="1",
-            name="Test Pharmacy",
-            phone="555-123-4567",
-            location="Test City",
-            rx_volume=1500,
-            contact_person="John Doe",
-            email="john@testpharmacy.com",
-        )
-        self.chatbot.conversation_history = [{"role": "user", "content": "test"}]
-        self.chatbot.current_state = ConversationState.DISCUSSING_SOLUTIONS
-
-        # Test
-        self.chatbot.reset_conversation()
-
-        # Assertions
-        self.assertEqual(self.chatbot.current_state, ConversationState.GREETING)
-        self.assertEqual(len(self.chatbot.conversation_history), 0)
-        self.assertIsNone(self.chatbot.pharmacy_data)
-
-    # Edge cases for chatbot
-    def test_start_call_api_failure(self):
-        """Test starting call when API fails."""
-        with patch.object(
-            self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-        ) as mock_get_pharmacy:
-            mock_get_pharmacy.side_effect = Exception("API Error")
-
-            result = self.chatbot.start_call("555-123-4567")
-
-            self.assertIn("having trouble accessing our system", result)
-            self.assertEqual(self.chatbot.current_state, ConversationState.ERROR)
-
-    def test_process_message_invalid_state(self):
-        """Test processing message with invalid state."""
-        self.chatbot.current_state = "INVALID_STATE"
-
-        result = self.chatbot.process_message("Hello")
-
-        # Should handle gracefully and provide fallback response
-        self.assertIsInstance(result, str)
-        self.assertGreater(len(result), 0)
-
-    def test_process_message_empty_input(self):
-        """Test processing empty message."""
-        result = self.chatbot.process_message("")
-
-        # Should handle gracefully
-        self.assertIsInstance(result, str)
-        self.assertGreater(len(result), 0)
-
-    def test_process_message_very_long_input(self):
-        """Test processing very long message."""
-        long_message = "A" * 10000
-        result = self.chatbot.process_message(long_message)
-
-        # Should handle gracefully
-        self.assertIsInstance(result, str)
-        self.assertGreater(len(result), 0)
-
-    def test_handle_error_recovery(self):
-        """Test error recovery mechanism."""
-        self.chatbot.current_state = ConversationState.ERROR
-
-        result = self.chatbot.process_message("Hello")
-
-        self.assertIn("back online", result)
-        self.assertEqual(self.chatbot.current_state, ConversationState.COLLECTING_INFO)
-
-    def test_manual_info_collection_edge_cases(self):
-        """Test manual info collection with edge cases."""
-        self.chatbot.current_state = ConversationState.COLLECTING_INFO
-        self.chatbot.ai_available = False
-
-        # Test with various input formats
-        test_cases = [
-            ("My pharmacy is called Test Pharmacy", "pharmacy_name"),
-            ("We're located in New York City", "location"),
-            ("We process 1500 prescriptions", "rx_volume"),
-            ("I'm the manager John Smith", "contact_person"),
-            ("My email is john@pharmacy.com", "email"),
-        ]
+    assert "email" in result.lower()
+    assert chatbot.current_state == ConversationState.OFFERING_FOLLOW_UP
 
-        for message, expected_field in test_cases:
-            result = self.chatbot.process_message(message)
-            # Should progress through the collection process
-            self.assertIsInstance(result, str)
-
-
-class TestIntegration(unittest.TestCase):
-    """Integration tests for the complete system."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            with patch("llm.OpenAI") as mock_openai:
-                # Mock the OpenAI client
-                mock_client = Mock()
-                mock_openai.return_value = mock_client
-                self.chatbot = PharmacyChatbot()
-
-    def test_complete_conversation_flow(self):
-        """Test a complete conversation flow."""
-        # Mock API responses
-        with patch.object(
-            self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-        ) as mock_get_pharmacy:
-            mock_get_pharmacy.return_value = None
-
-            # Mock AI extraction - provide complete info from the start
-            with patch.object(self.chatbot, "_extract_pharmacy_info") as mock_extract:
-                mock_extract.return_value = {
-                    "pharmacy_name": "Test Pharmacy",
-                    "location": "Test City",
-                    "rx_volume": 1500,
-                    "contact_person": "John Doe",
-                    "email": "john@testpharmacy.com",
-                }
-
-                # Start call
-                greeting = self.chatbot.start_call("555-999-9999")
-                self.assertIn("Pharmesol", greeting)
-
-                # Provide pharmacy information - this should move to solution discussion
-                response1 = self.chatbot.process_message(
-                    "My pharmacy is Test Pharmacy in Test City, we process 1500 prescriptions"
-                )
-                self.assertIn("high-volume", response1)
 
-                # Express interest
-                response2 = self.chatbot.process_message(
-                    "Yes, I would like more information"
-                )
-                self.assertIn("email", response2.lower())
+def test_get_conversation_summary(chatbot):
+    """Test getting conversation summary."""
+    # Set up some conversation data
+    chatbot.pharmacy_data = _TEST_PHARMACY
+    chatbot.conversation_history = [{"role": "user", "content": "test"}]
 
-                # Request email
-                response3 = self.chatbot.process_message(
-                    "Please send me information via email"
-                )
-                self.assertIn("sent you detailed information", response3)
-
-    def test_integration_with_api_failures(self):
-        """Test integration when API fails intermittently."""
-        with patch.object(
-            self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-        ) as mock_get_pharmacy:
-            # First call fails, second succeeds
-            mock_get_pharmacy.side_effect = [Exception("API Error"), None]
-
-            # First call should handle error gracefully
-            result1 = self.chatbot.start_call("555-123-4567")
-            self.assertIn("having trouble accessing our system", result1)
-
-            # Reset and try again
-            self.chatbot.reset_conversation()
-            result2 = self.chatbot.start_call("555-123-4567")
-            self.assertIn("Pharmesol", result2)
-
-    def test_integration_with_ai_failures(self):
-        """Test integration when AI fails intermittently."""
-        with patch.object(
-            self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-        ) as mock_get_pharmacy:
-            mock_get_pharmacy.return_value = None
-
-            with patch.object(self.chatbot, "_extract_pharmacy_info") as mock_extract:
-                # First call fails, second succeeds
-                mock_extract.side_effect = [
-                    Exception("AI Error"),
-                    {
-                        "pharmacy_name": "Test Pharmacy",
-                        "location": "Test City",
-                        "rx_volume": 1500,
-                        "contact_person": "John Doe",
-                        "email": "john@testpharmacy.com",
-                    },
-                ]
-
-                # Start call
-                greeting = self.chatbot.start_call("555-999-9999")
-                self.assertIn("Pharmesol", greeting)
-
-                # First message should fall back to manual collection
-                response1 = self.chatbot.process_message("My pharmacy is Test Pharmacy")
-                self.assertIsInstance(response1, str)
-
-                # Second message should work with AI
-                response2 = self.chatbot.process_message(
-                    "We're in Test City with 1500 prescriptions"
-                )
-                self.assertIn("high-volume", response2)
-
-
-class TestEdgeCases(unittest.TestCase):
-    """Test cases for various edge cases and error scenarios."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-            with patch("llm.OpenAI") as mock_openai:
-                mock_client = Mock()
-                mock_openai.return_value = mock_client
-                self.chatbot = PharmacyChatbot()
-
-    def test_phone_number_edge_cases(self):
-        """Test various phone number formats and edge cases."""
-        test_cases = [
-            ("", None),  # Empty phone number
-            ("123", None),  # Too short
-            ("12345678901234567890", None),  # Too long
-            ("abc-def-ghij", None),  # Non-numeric
-            ("555-123-4567", "5551234567"),  # Standard format
-            ("(555) 123-4567", "5551234567"),  # Parentheses
-            ("555.123.4567", "5551234567"),  # Dots
-            ("555 123 4567", "5551234567"),  # Spaces
-        ]
+    summary = chatbot.get_conversation_summary()
 
-        for phone, expected in test_cases:
-            if expected is None:
-                # Should handle gracefully
-                result = self.chatbot.start_call(phone)
-                self.assertIsInstance(result, str)
-            else:
-                # Should clean properly
-                cleaned = self.chatbot.pharmacy_api._clean_phone_number(phone)
-                self.assertEqual(cleaned, expected)
-
-    def test_rx_volume_edge_cases(self):
-        """Test various prescription volume formats."""
-        test_cases = [
-            ("0", 0),  # Zero
-            ("999999", 999999),  # Very large number
-            ("1500", 1500),  # Standard format
-            ("1.5k", None),  # With k suffix
-            ("fifteen hundred", None),  # Text
-            ("", None),  # Empty
-        ]
+    assert "state" in summary
+    assert "pharmacy_data" in summary
+    assert "collected_info" in summary
+    assert "conversation_length" in summary
+    assert "follow_up_actions" in summary
 
-        for volume_str, expected in test_cases:
-            if expected is not None:
-                # Test parsing
-                data = {"rx_volume": volume_str}
-                result = self.chatbot.pharmacy_api._parse_pharmacy_data(data)
-                self.assertEqual(result.rx_volume, expected)
-
-    def test_email_edge_cases(self):
-        """Test various email formats."""
-        test_cases = [
-            ("john@pharmacy.com", True),  # Valid
-            ("john.doe@pharmacy.com", True),  # With dot
-            ("john+test@pharmacy.com", True),  # With plus
-            ("john@pharmacy.co.uk", True),  # Different TLD
-            ("invalid-email", False),  # Invalid
-            ("john@", False),  # Incomplete
-            ("@pharmacy.com", False),  # Missing local part
-            ("", False),  # Empty
-        ]
 
-        for email, is_valid in test_cases:
-            # Test extraction
-            if is_valid:
-                result = self.chatbot._extract_pharmacy_info(f"My email is {email}")
-                # Should extract valid emails
-                pass  # Add assertions based on implementation
-
-    def test_conversation_history_limits(self):
-        """Test conversation history management."""
-        # Add many messages to test history limits
-        for i in range(20):
-            self.chatbot.conversation_history.append(
-                {"role": "user", "content": f"Message {i}"}
-            )
+def test_reset_conversation(chatbot):
+    """Test resetting conversation."""
+    # Set up some conversation data
+    chatbot.pharmacy_data = _TEST_PHARMACY
+    chatbot.conversation_history = [{"role": "user", "content": "test"}]
+    chatbot.current_state = ConversationState.DISCUSSING_SOLUTIONS
+
+    chatbot.reset_conversation()
+
+    assert chatbot.current_state == ConversationState.GREETING
+    assert len(chatbot.conversation_history) == 0
+    assert chatbot.pharmacy_data is None
+
+
+# Edge cases for chatbot
+def test_start_call_api_failure(chatbot):
+    """Test starting call when API fails."""
+    with patch.object(chatbot.pharmacy_api, "get_pharmacy_by_phone") as mock_get:
+        mock_get.side_effect = Exception("API Error")
+
+        result = chatbot.start_call("555-123-4567")
 
-        # Should handle long history gracefully
-        result = self.chatbot.process_message("Test message")
-        self.assertIsInstance(result, str)
-
-    def test_concurrent_api_calls(self):
-        """Test handling of concurrent API calls."""
-        import threading
-        import time
-
-        results = []
-
-        def make_api_call():
-            try:
-                with patch.object(
-                    self.chatbot.pharmacy_api, "get_pharmacy_by_phone"
-                ) as mock_get_pharmacy:
-                    mock_get_pharmacy.return_value = None
-                    result = self.chatbot.start_call("555-123-4567")
-                    results.append(result)
-            except Exception as e:
-                results.append(f"Error: {e}")
-
-        # Start multiple threads
-        threads = []
-        for i in range(5):
-            thread = threading.Thread(target=make_api_call)
-            threads.append(thread)
-            thread.start()
-
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-
-        # All calls should complete successfully
-        self.assertEqual(len(results), 5)
-        for result in results:
-            self.assertIsInstance(result, str)
-            self.assertGreater(len(result), 0)
+        assert "having trouble accessing our system" in result
+        assert chatbot.current_state == ConversationState.ERROR
+
+
+def test_process_message_invalid_state(chatbot):
+    """Test processing message with invalid state."""
+    chatbot.current_state = "INVALID_STATE"
+
+    result = chatbot.process_message("Hello")
+
+    # Should handle gracefully and provide fallback response
+    assert isinstance(result, str)
+    assert len(result) > 0
+
+
+def test_process_message_empty_input(chatbot):
+    """Test processing empty message."""
+    result = chatbot.process_message("")
+
+    # Should handle gracefully
+    assert isinstance(result, str)
+    assert len(result) > 0
+
+
+@pytest.mark.slow
+@pytest.mark.timeout(10)
+def test_process_message_very_long_input(chatbot):
+    """Test processing very long message."""
+    result = chatbot.process_message("A" * 10000)
+
+    # Should handle gracefully
+    assert isinstance(result, str)
+    assert len(result) > 0
+
+
+def test_handle_error_recovery(chatbot):
+    """Test error recovery mechanism."""
+    chatbot.current_state = ConversationState.ERROR
+
+    result = chatbot.process_message("Hello")
+
+    assert "back online" in result
+    assert chatbot.current_state == ConversationState.COLLECTING_INFO
+
+
+@pytest.mark.parametrize(
+    "message,expected_field",
+    [
+        ("My pharmacy is called Test Pharmacy", "pharmacy_name"),
+        ("We're located in New York City", "location"),
+        ("We process 1500 prescriptions", "rx_volume"),
+        ("I'm the manager John Smith", "contact_person"),
+        ("My email is john@pharmacy.com", "email"),
+    ],
+)
+def test_manual_info_collection_edge_cases(chatbot, message, expected_field):
+    """Manual collection handles each input format without AI."""
+    chatbot.current_state = ConversationState.COLLECTING_INFO
+    chatbot.ai_available = False
+
+    result = chatbot.process_message(message)
+    # Should progress through the collection process
+    assert isinstance(result, str)
+
+
+# ---------------------------------------------------------------------------
+# Integration
+# ---------------------------------------------------------------------------
+
+
+# Table-driven conversation scenarios. Each step is (action, payload,
+# expected) where action is "start", "message" or "reset" and expected is a
+# lowercase substring of the response ("" checks only that a string came
+# back). "get_pharmacy" and "extract" list the mocked results in call order;
+# an Exception entry makes that call raise.
+_CONVERSATION_SCENARIOS = {
+    "new_lead_happy_path": {
+        "get_pharmacy": [None],
+        "extract": [_COMPLETE_INFO],
+        "steps": [
+            ("start", "555-999-9999", "pharmesol"),
+            # Providing pharmacy information moves to solution discussion
+            (
+                "message",
+                "My pharmacy is Test Pharmacy in Test City, we process 1500 prescriptions",
+                "high-volume",
+            ),
+            ("message", "Yes, I would like more information", "email"),
+            (
+                "message",
+                "Please send me information via email",
+                "sent you detailed information",
+            ),
+        ],
+    },
+    "api_fail_then_ok": {
+        "get_pharmacy": [Exception("API Error"), None],
+        "extract": [],
+        "steps": [
+            ("start", "555-123-4567", "having trouble accessing our system"),
+            ("reset", None, None),
+            ("start", "555-123-4567", "pharmesol"),
+        ],
+    },
+    "ai_fail_then_ok": {
+        "get_pharmacy": [None],
+        "extract": [Exception("AI Error"), _COMPLETE_INFO],
+        "steps": [
+            ("start", "555-999-9999", "pharmesol"),
+            # First message falls back to manual collection
+            ("message", "My pharmacy is Test Pharmacy", ""),
+            ("message", "We're in Test City with 1500 prescriptions", "high-volume"),
+        ],
+    },
+}
+
+
+@pytest.mark.parametrize("scenario_name", sorted(_CONVERSATION_SCENARIOS))
+def test_conversation_scenarios(chatbot, scenario_name):
+    """Replay a scripted conversation and check each response."""
+    scenario = _CONVERSATION_SCENARIOS[scenario_name]
+    with patch.object(chatbot.pharmacy_api, "get_pharmacy_by_phone") as mock_get:
+        mock_get.side_effect = list(scenario["get_pharmacy"])
+
+        with patch.object(chatbot, "_extract_pharmacy_info") as mock_extract:
+            mock_extract.side_effect = [
+                item if isinstance(item, Exception) else dict(item)
+                for item in scenario["extract"]
+            ]
+
+            for action, payload, expected in scenario["steps"]:
+                if action == "reset":
+                    chatbot.reset_conversation()
+                    continue
+                if action == "start":
+                    response = chatbot.start_call(payload)
+                else:
+                    response = chatbot.process_message(payload)
+                assert isinstance(response, str)
+                if expected:
+                    assert expected in response.lower()
+
+
+# ---------------------------------------------------------------------------
+# Edge cases and error scenarios
+# ---------------------------------------------------------------------------
+
+
+def test_phone_number_edge_cases(chatbot):
+    """Test various phone number formats and edge cases."""
+    test_cases = [
+        ("", None),  # Empty phone number
+        ("123", None),  # Too short
+        ("12345678901234567890", None),  # Too long
+        ("abc-def-ghij", None),  # Non-numeric
+        ("555-123-4567", "5551234567"),  # Standard format
+        ("(555) 123-4567", "5551234567"),  # Parentheses
+        ("555.123.4567", "5551234567"),  # Dots
+        ("555 123 4567", "5551234567"),  # Spaces
+    ]
+
+    for phone, expected in test_cases:
+        if expected is None:
+            # Should handle gracefully
+            result = chatbot.start_call(phone)
+            assert isinstance(result, str)
+        else:
+            # Should clean properly
+            assert chatbot.pharmacy_api._clean_phone_number(phone) == expected
+
+
+def test_rx_volume_edge_cases(chatbot):
+    """Test various prescription volume formats."""
+    test_cases = [
+        ("0", 0),  # Zero
+        ("999999", 999999),  # Very large number
+        ("1500", 1500),  # Standard format
+        ("1.5k", None),  # With k suffix
+        ("fifteen hundred", None),  # Text
+        ("", None),  # Empty
+    ]
+
+    for volume_str, expected in test_cases:
+        if expected is not None:
+            # Test parsing
+            data = {"rx_volume": volume_str}
+            result = chatbot.pharmacy_api._parse_pharmacy_data(data)
+            assert result.rx_volume == expected
+
+
+def test_email_edge_cases(chatbot):
+    """Test various email formats."""
+    test_cases = [
+        ("john@pharmacy.com", True),  # Valid
+        ("john.doe@pharmacy.com", True),  # With dot
+        ("john+test@pharmacy.com", True),  # With plus
+        ("john@pharmacy.co.uk", True),  # Different TLD
+        ("invalid-email", False),  # Invalid
+        ("john@", False),  # Incomplete
+        ("@pharmacy.com", False),  # Missing local part
+        ("", False),  # Empty
+    ]
+
+    for email, is_valid in test_cases:
+        # Test extraction
+        if is_valid:
+            result = chatbot._extract_pharmacy_info(f"My email is {email}")
+            # Should extract valid emails
+            pass  # Add assertions based on implementation
+
+
+def test_conversation_history_limits(chatbot):
+    """Test conversation history management."""
+    # Add many messages to test history limits
+    for i in range(20):
+        chatbot.conversation_history.append(
+            {"role": "user", "content": f"Message {i}"}
+        )
+
+    # Should handle long history gracefully
+    result = chatbot.process_message("Test message")
+    assert isinstance(result, str)
+
+
+def test_concurrent_api_calls(chatbot):
+    """Test handling of concurrent API calls."""
+
+    def make_api_call(_):
+        try:
+            with patch.object(
+                chatbot.pharmacy_api, "get_pharmacy_by_phone"
+            ) as mock_get:
+                mock_get.return_value = None
+                return chatbot.start_call("555-123-4567")
+        except Exception as e:
+            return f"Error: {e}"
+
+    # A pool amortizes thread startup and ex.map collects results in
+    # order without a shared list.
+    with ThreadPoolExecutor(max_workers=5) as ex:
+        results = list(ex.map(make_api_call, range(5)))
+
+    # All calls should complete successfully
+    assert len(results) == 5
+    for result in results:
+        assert isinstance(result, str)
+        assert len(result) > 0
+
+
+# ---------------------------------------------------------------------------
+# Performance regression guards
+# ---------------------------------------------------------------------------
+
+
+def test_extraction_cycle_allocations(chatbot):
+    """Stubbed extraction cycles must not regress into heavy allocation.
+
+    Guards the Mock-to-SimpleNamespace fixture savings: ten uncached
+    extraction calls against a stubbed client should stay comfortably
+    under a generous allocation budget.
+    """
+    try:
+        chatbot._extract_pharmacy_info("warmup message")
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        for i in range(10):
+            chatbot._extract_cache.clear()
+            chatbot._extract_pharmacy_info(f"benchmark message {i}")
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(
+        stat.size_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.size_diff > 0
+    )
+    assert allocated < 256 * 1024
+
+
+def test_extraction_cycle_benchmark(chatbot, benchmark):
+    """Track the latency of an uncached, stubbed extraction cycle."""
+    def run():
+        chatbot._extract_cache.clear()
+        chatbot._extract_pharmacy_info("benchmark message")
+
+    benchmark(run)
 
 
 if __name__ == "__main__":
-    unittest.main()
+    raise SystemExit(pytest.main([__file__]))